@@ -7,11 +7,18 @@ from app.infrastructure.llm_client import LLMClient
 from app.infrastructure.tts_client import TTSClient
 from app.domain.prompt_builder import PromptBuilder
 from app.domain.conversation import ConversationManager
-from app.domain.grammar.grammar_service import GrammarService
+from app.domain.grammar.diff import compute_edits
+from app.domain.grammar.grammar_service import GrammarService, split_sentences
 from app.guardrails.guardrails import Guardrails
 from app.infrastructure.config_service import JsonConfigService
+from collections import deque
+import asyncio
 import base64
 
+# Sentences synthesized ahead of the one being played; the rest wait their turn,
+# so one long reply can't fill the shared TTS queue
+SPEECH_LOOKAHEAD = 2
+
 class Orchestrator:
     def __init__(self):
         # Initialize all services
@@ -24,24 +31,30 @@ class Orchestrator:
         self.guardrails = Guardrails()
         self.config_service = JsonConfigService()
 
-    def handle_chat_request(self, request: ChatRequest) -> ChatResponse:
-        # 1. Fetch Config & Construct System Prompt
+    def _chat_prompts(self, request: ChatRequest):
+        # Fetch Config & Construct System Prompt
         config = self.config_service.get_config()
         system_prompt = self.prompt_builder.build_system_prompt(config.behavior_settings, request.context)
         formatted_history = self.prompt_builder.format_conversation_history(request.conversation_history)
         
         # Combine into complete user message context
         full_user_message = f"{formatted_history}\nUser: {request.message}"
+        return system_prompt, full_user_message
+
+    async def handle_chat_request(self, request: ChatRequest) -> ChatResponse:
+        # 1. Build the prompts
+        system_prompt, full_user_message = self._chat_prompts(request)
         
         # 2. Call LLM
-        raw_response = self.llm_client.generate_chat_response(system_prompt, full_user_message)
+        raw_response = await self.llm_client.agenerate_chat_response(system_prompt, full_user_message)
         
         # 3. Apply Guardrails
         safe_response = self.guardrails.validate_response(raw_response)
 
         # 4. Optional: Generate Speech for the chat response (Voice Assistant feature)
         # Assuming we want the chat to speak back.
-        #audio_bytes = self.tts_client.text_to_speech(safe_response)
+        #audio_bytes = await self.tts_client.atext_to_speech(safe_response)
+        # (or stream it sentence by sentence: stream_chat_speech)
         
         # Encode audio to base64
         # audio_b64 = base64.b64encode(audio_bytes).decode('utf-8') if audio_bytes else None
@@ -51,19 +64,113 @@ class Orchestrator:
             # speech_output=audio_b64
         )
 
-    def handle_learn_request(self, request: LearnRequest) -> LearnResponse:
+    async def stream_chat_request(self, request: ChatRequest):
+        """
+        Streams the chat response as (event, text) pairs:
+        ("token", text) as the model writes, then ("done", full_text).
+        If a guardrail trips mid-stream, ("replace", safe_text) tells the client
+        to swap out everything shown so far.
+        """
+        system_prompt, full_user_message = self._chat_prompts(request)
+        guard = self.guardrails.stream_guard()
+        sent = []
+
+        async for chunk in self.llm_client.astream_chat_response(system_prompt, full_user_message):
+            safe = guard.feed(chunk)
+            if guard.blocked:
+                break
+            if safe:
+                sent.append(safe)
+                yield "token", safe
+
+        if guard.blocked:
+            yield "replace", Guardrails.BLOCKED_RESPONSE
+            yield "done", Guardrails.BLOCKED_RESPONSE
+            return
+
+        tail = guard.finish()
+        if tail:
+            sent.append(tail)
+            yield "token", tail
+        full_text = "".join(sent)
+        if not full_text:
+            full_text = Guardrails.EMPTY_RESPONSE
+            yield "replace", full_text
+        yield "done", full_text
+
+    async def stream_chat_speech(self, request: ChatRequest):
+        """
+        Streams the chat response with speech, as (event, data) pairs.
+        Text events are the same as stream_chat_request's. Each sentence is sent to
+        TTS as soon as it is complete, and ("audio", {index, text, audio}) goes out
+        as soon as it is synthesized, in order, so the first sentence can play
+        while the model is still writing the rest. audio is None if TTS failed.
+        """
+        waiting = deque()   # complete sentences not yet sent to TTS
+        inflight = deque()  # (sentence, synthesis task), in reply order
+        index = 0
+        buffer = ""
+
+        def start_synthesis():
+            while waiting and len(inflight) < SPEECH_LOOKAHEAD:
+                sentence = waiting.popleft()
+                inflight.append((sentence, asyncio.create_task(self.tts_client.atext_to_speech(sentence))))
+
+        def take_sentences(text):
+            # Queue every complete sentence; the last piece may still be growing
+            sentences, _ = split_sentences(text)
+            waiting.extend(sentence for sentence in sentences[:-1] if sentence.strip())
+            return sentences[-1]
+
+        def audio_event(sentence, audio_bytes):
+            nonlocal index
+            index += 1
+            audio_b64 = base64.b64encode(audio_bytes).decode('utf-8') if audio_bytes else None
+            return "audio", {"index": index - 1, "text": sentence, "audio": audio_b64}
+
+        try:
+            async for event, text in self.stream_chat_request(request):
+                if event == "replace":
+                    # Whatever was spoken so far is void; speak the replacement instead
+                    for _, task in inflight:
+                        task.cancel()
+                    inflight.clear()
+                    waiting.clear()
+                    index = 0
+                    buffer = take_sentences(text)
+                elif event == "token":
+                    buffer = take_sentences(buffer + text)
+                elif event == "done" and buffer.strip():
+                    waiting.append(buffer.strip())
+                    buffer = ""
+                yield event, {"text": text}
+
+                start_synthesis()
+                while inflight and inflight[0][1].done():
+                    sentence, task = inflight.popleft()
+                    yield audio_event(sentence, task.result())
+                    start_synthesis()
+
+            while inflight:
+                sentence, task = inflight.popleft()
+                start_synthesis()
+                yield audio_event(sentence, await task)
+        finally:
+            for _, task in inflight:
+                task.cancel()
+
+    async def handle_learn_request(self, request: LearnRequest) -> LearnResponse:
         """
         Handles Pronunciation + Word Description request.
         """
         word = request.word
 
-        # 1. Generate Description via LLM
-        # We can reuse generate_description or create a more specific prompt
-        description = self.llm_client.generate_description(word)
-        
-        # 2. Generate Pronunciation Audio via TTS
-        # The user specifically asked for pronunciation to be done by TTS
-        audio_bytes = self.tts_client.text_to_speech(word)
+        # 1. Description via LLM and 2. pronunciation via TTS, run side by side:
+        # the LLM call is awaited on the event loop while TTS runs on its executor
+        description, audio_bytes = await asyncio.gather(
+            self.llm_client.agenerate_description(word),
+            self.tts_client.atext_to_speech(word),
+        )
 
         # Encode audio to base64
         audio_b64 = base64.b64encode(audio_bytes).decode('utf-8') if audio_bytes else None
@@ -73,15 +180,19 @@ class Orchestrator:
             pronunciation_audio=audio_b64
         )
 
-    def handle_grammar_request(self, request: GrammarRequest) -> GrammarResponse:
+    async def handle_grammar_request(self, request: GrammarRequest) -> GrammarResponse:
         """
         Handles Grammar Correction request.
         """
         text = request.text
         
         # 1. Correct Grammar
-        corrected_text = self.grammar_service.correct_grammar(text)
+        corrected_text = await self.grammar_service.correct_grammar(text)
+
+        # 2. Express the changes as spans the client can underline
+        edits = compute_edits(text, corrected_text)
         
         return GrammarResponse(
-            corrected_text=corrected_text
+            corrected_text=corrected_text,
+            edits=edits
         )
@@ -0,0 +1,74 @@
+"""
+Word-level diff between a text and its corrected version, as span edits.
+
+Each edit says: replace `length` characters of the original, starting at
+`offset`, with `replacement`. Applying the edits from the last to the first
+turns the original into the corrected text.
+"""
+from difflib import SequenceMatcher
+import re
+import string
+
+WORD = re.compile(r"\S+")
+
+
+def _words(text: str):
+    return [(match.group(), match.start(), match.end()) for match in WORD.finditer(text)]
+
+
+def _category(before: str, after: str) -> str:
+    if before.lower() == after.lower():
+        return "capitalization"
+    if before.strip(string.punctuation).lower() == after.strip(string.punctuation).lower():
+        return "punctuation"
+    if " " not in before and " " not in after and SequenceMatcher(None, before.lower(), after.lower()).ratio() >= 0.6:
+        return "spelling"
+    return "grammar"
+
+
+def compute_edits(original: str, corrected: str) -> list:
+    """
+    [{"offset", "length", "replacement", "category"}] turning `original` into `corrected`.
+    Whitespace-only differences are ignored.
+    """
+    before = _words(original)
+    after = _words(corrected)
+    matcher = SequenceMatcher(None, [w for w, _, _ in before], [w for w, _, _ in after], autojunk=False)
+
+    edits = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        replacement = " ".join(w for w, _, _ in after[j1:j2])
+
+        if tag == "insert":
+            if i1 < len(before):
+                # New words go in front of the next original word
+                offset, length, replacement = before[i1][1], 0, replacement + " "
+            else:
+                offset, length = len(original.rstrip()), 0
+                replacement = (" " if offset else "") + replacement
+            category = "grammar"
+        else:
+            offset = before[i1][1]
+            end = before[i2 - 1][2]
+            if tag == "delete":
+                # Take one neighbouring space along so no double space is left behind
+                if end < len(original) and original[end] == " ":
+                    end += 1
+                elif offset > 0 and original[offset - 1] == " ":
+                    offset -= 1
+                category = "grammar"
+            else:
+                category = _category(original[offset:end], replacement)
+            length = end - offset
+
+        edits.append({"offset": offset, "length": length, "replacement": replacement, "category": category})
+    return edits
+
+
+def apply_edits(original: str, edits: list) -> str:
+    text = original
+    for edit in sorted(edits, key=lambda edit: edit["offset"], reverse=True):
+        text = text[:edit["offset"]] + edit["replacement"] + text[edit["offset"] + edit["length"]:]
+    return text
@@ -1,26 +1,152 @@
-from app.infrastructure.llm_client import LLMClient
+import json
+import os
+import re
+
+from app.domain.grammar.spellcheck import SpellChecker, quick_correct
+from app.infrastructure.llm_client import FALLBACK_RESPONSE, LLMClient
+
+# Sentences that only need spelling fixes are corrected locally, without the LLM
+FAST_PATH_ENABLED = os.getenv("GRAMMAR_FAST_PATH", "true").lower() == "true"
+
+# Split at whitespace after sentence-ending punctuation (optionally followed by a closing
+# quote/bracket, which stays with its sentence) or at line breaks.
+# The separators are captured so the text can be put back together exactly.
+SENTENCE_BOUNDARY = re.compile(r"((?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+|\n+)")
+
+WHOLE_TEXT_PROMPT = (
+    "You are a helpful grammar assistant. "
+    "Your sole task is to correct the grammar of the user's input. "
+    "Return ONLY the corrected text. "
+    "Do not add explanations, quotes, or conversational filler. "
+    "If the text is already correct, return it as is."
+)
+
+SENTENCE_BATCH_PROMPT = (
+    "You are a helpful grammar assistant. "
+    "The user sends a JSON array of sentences. Correct the grammar and spelling of each one. "
+    "Reply with ONLY a JSON array of strings: the corrected sentences, in the same order "
+    "and with the same number of items. Leave correct sentences unchanged."
+)
+
+# A ```json ... ``` fence some models wrap their reply in, despite the prompt
+CODE_FENCE = re.compile(r"```[\w-]*\s*(.*?)\s*```", re.DOTALL)
+
+# Cache key prompt for single corrected sentences (never sent to the model)
+SENTENCE_CACHE_PROMPT = "grammar:sentence"
+
+
+def split_sentences(text: str):
+    """
+    Returns (sentences, separators) where
+    text == sentences[0] + separators[0] + sentences[1] + ... + sentences[-1].
+    """
+    parts = SENTENCE_BOUNDARY.split(text)
+    return parts[0::2], parts[1::2]
+
+
+def join_sentences(sentences, separators) -> str:
+    pieces = []
+    for index, sentence in enumerate(sentences):
+        pieces.append(sentence)
+        if index < len(separators):
+            pieces.append(separators[index])
+    return "".join(pieces)
+
+
+def parse_json_array(reply: str):
+    """
+    Returns the first JSON array in an LLM reply, ignoring a code fence and any
+    text around it, or raises ValueError if there is none.
+    """
+    if not isinstance(reply, str):
+        raise ValueError("reply is not text")
+    fenced = CODE_FENCE.search(reply)
+    if fenced:
+        reply = fenced.group(1)
+    start = reply.find("[")
+    if start < 0:
+        raise ValueError("no JSON array in reply")
+    value, _ = json.JSONDecoder().raw_decode(reply, start)
+    return value
+
 
 class GrammarService:
-    def __init__(self, llm_client: LLMClient = None):
+    def __init__(self, llm_client: LLMClient = None, spell_checker: SpellChecker = None):
         # We allow passing llm_client to avoid re-initializing it if shared, 
         # though Orchestrator passes it.
         self.llm_client = llm_client or LLMClient()
+        if spell_checker is None and FAST_PATH_ENABLED:
+            spell_checker = SpellChecker().load()
+        self.spell_checker = spell_checker
+
+    def _sentence_key(self, sentence: str) -> str:
+        return self.llm_client.cache.make_key(
+            self.llm_client.model, self.llm_client.temperature, SENTENCE_CACHE_PROMPT, sentence
+        )
 
-    def correct_grammar(self, text: str) -> str:
+    async def correct_grammar(self, text: str) -> str:
         """
-        Corrects grammar using the LLM.
+        Corrects grammar sentence by sentence.
+        Sentences that are in-vocabulary (or only misspelled) are fixed by the local
+        spell checker, and sentences corrected before come from the cache; only the
+        rest go to the LLM, together in one prompt. So re-checking a story after a
+        small edit costs one short call at most.
         """
-        system_prompt = (
-            "You are a helpful grammar assistant. "
-            "Your sole task is to correct the grammar of the user's input. "
-            "Return ONLY the corrected text. "
-            "Do not add explanations, quotes, or conversational filler. "
-            "If the text is already correct, return it as is."
+        sentences, separators = split_sentences(text)
+        corrected = {}
+        unseen = []
+        for sentence in sentences:
+            if not re.search(r"\w", sentence) or sentence in corrected or sentence in unseen:
+                continue
+            if self.spell_checker is not None:
+                quick = quick_correct(sentence, self.spell_checker)
+                if quick is not None:
+                    corrected[sentence] = quick
+                    continue
+            cached = await self.llm_client.cache.aget(self._sentence_key(sentence), "grammar")
+            if cached is not None:
+                corrected[sentence] = cached
+            else:
+                unseen.append(sentence)
+
+        if unseen:
+            fixed = await self._correct_batch(unseen)
+            if fixed is None:
+                return await self._correct_whole_text(text)
+            for sentence, result in zip(unseen, fixed):
+                corrected[sentence] = result
+                await self.llm_client.cache.aset(self._sentence_key(sentence), result, "grammar")
+
+        return join_sentences([corrected.get(sentence, sentence) for sentence in sentences], separators)
+
+    async def _correct_batch(self, sentences):
+        """
+        Corrects several sentences in one LLM call.
+        Returns the corrected list, or None if the reply isn't a matching JSON array.
+        """
+        reply = await self.llm_client.agenerate_chat_response(
+            SENTENCE_BATCH_PROMPT, json.dumps(sentences, ensure_ascii=False), endpoint="grammar"
         )
-        
+        try:
+            fixed = parse_json_array(reply)
+        except ValueError:
+            print("Grammar batch reply was not JSON, correcting the whole text instead")
+            return None
+        if (
+            not isinstance(fixed, list)
+            or len(fixed) != len(sentences)
+            or not all(isinstance(item, str) for item in fixed)
+        ):
+            print("Grammar batch reply did not match the sentences sent, correcting the whole text instead")
+            return None
+        return [item.strip() for item in fixed]
+
+    async def _correct_whole_text(self, text: str) -> str:
         try:
             # Reusing the chat generation method
-            corrected_text = self.llm_client.generate_chat_response(system_prompt, text)
+            corrected_text = await self.llm_client.agenerate_chat_response(WHOLE_TEXT_PROMPT, text, endpoint="grammar")
+            if corrected_text == FALLBACK_RESPONSE:
+                return text
             return corrected_text.strip()
         except Exception as e:
             print(f"Grammar correction failed: {e}")
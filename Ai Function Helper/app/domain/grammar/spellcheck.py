@@ -0,0 +1,254 @@
+"""
+In-process spell checker (symmetric delete, after SymSpell).
+
+Every dictionary word is indexed under all the strings you get by deleting up
+to `max_edit_distance` characters from its first `prefix_length` letters. A
+misspelling is looked up the same way: its own deletes hit the index, and the
+few candidates that come back are checked with a real edit distance. No
+candidate generation by insertion/substitution is needed, so a lookup is a
+handful of dict reads.
+
+The bundled dictionary (data/frequency_dictionary_en_30k.txt) is the 30,000
+most frequent words of SymSpell's English frequency dictionary (MIT licensed,
+see data/LICENSE).
+"""
+import os
+import re
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), "data", "frequency_dictionary_en_30k.txt")
+
+WORD = re.compile(r"[A-Za-z]+(?:['\u2019][A-Za-z]+)?")
+CONTRACTION_SUFFIXES = ("n't", "'s", "'re", "'ll", "'ve", "'d", "'m")
+# Contractions whose stem isn't a word on its own
+IRREGULAR_CONTRACTIONS = {"can't", "won't", "shan't", "ain't", "y'all", "o'clock", "ma'am"}
+
+# Object pronouns opening a sentence ("Me go home.") are the most common grammar slip
+OBJECT_PRONOUNS = {"me", "him", "her", "us", "them"}
+
+# Inflectional endings; a respelling that loses one changes the grammar, not just the
+# spelling ("childs" -> "child", "jumpd" -> "jump"), so those words go to the LLM
+INFLECTIONS = ("ing", "es", "ed", "s", "d")
+
+# Words that are often the wrong one of a set that all spell-check fine
+HOMOPHONES = {"their", "there", "they're", "your", "you're", "its", "it's", "to", "too", "two",
+              "then", "than", "were", "where", "we're", "whose", "who's"}
+# Verb forms that disagree with a plural / singular pronoun right before them
+PLURAL_SUBJECTS = {"we", "they", "you"}
+SINGULAR_VERBS = {"was", "is", "has", "does", "goes", "am"}
+FIRST_PERSON_MISMATCHES = {"is", "are", "were", "has", "does", "goes"}
+SINGULAR_SUBJECTS = {"he", "she", "it"}
+# What may follow he/she/it besides a word ending in -s or -ed
+SINGULAR_FOLLOWERS = {"was", "is", "has", "does", "did", "had", "can", "could", "will", "would",
+                      "should", "may", "might", "must", "never", "always", "also", "often",
+                      "just", "still", "really", "usually", "sometimes", "and", "or", "too"}
+# Participles that need a helper verb ("I seen" -> "I saw")
+PARTICIPLES = {"seen", "done", "been", "gone", "taken", "eaten", "written", "given", "broken", "spoken"}
+SUBJECTS = {"i", "we", "they", "you", "he", "she", "it"}
+# Time words that fix the tense; a verb that doesn't match them is a grammar slip
+TENSE_MARKERS = {"yesterday", "ago", "tomorrow"}
+LAST_PERIODS = {"night", "week", "weekend", "month", "year", "summer", "winter", "time"}
+
+# A local correction must be this many times more frequent than any equally close
+# alternative ("frend" -> "friend" is safe, "parc" -> "part"/"park" is not)
+AMBIGUITY_RATIO = 5
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Damerau-Levenshtein (optimal string alignment) distance, or limit + 1 once it is exceeded.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class SpellChecker:
+    def __init__(self, max_edit_distance: int = 2, prefix_length: int = 7):
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.words = {}    # word -> frequency
+        self.deletes = {}  # delete variant -> word, or tuple of words when several share it
+
+    def _delete_variants(self, word: str) -> set:
+        variants = {word}
+        frontier = {word}
+        for _ in range(self.max_edit_distance):
+            next_frontier = set()
+            for item in frontier:
+                if len(item) <= 1:
+                    continue
+                for index in range(len(item)):
+                    next_frontier.add(item[:index] + item[index + 1:])
+            next_frontier -= variants
+            variants |= next_frontier
+            frontier = next_frontier
+        return variants
+
+    def add_word(self, word: str, count: int):
+        self.words[word] = count
+        for variant in self._delete_variants(word[:self.prefix_length]):
+            existing = self.deletes.get(variant)
+            if existing is None:
+                self.deletes[variant] = word
+            elif isinstance(existing, tuple):
+                self.deletes[variant] = existing + (word,)
+            else:
+                self.deletes[variant] = (existing, word)
+
+    def load(self, path: str = DICTIONARY_PATH) -> "SpellChecker":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    self.add_word(parts[0], int(parts[1]))
+        return self
+
+    def is_known(self, word: str) -> bool:
+        word = word.lower().replace("\u2019", "'")
+        if word in self.words or word in IRREGULAR_CONTRACTIONS:
+            return True
+        for suffix in CONTRACTION_SUFFIXES:
+            if word.endswith(suffix) and word[:-len(suffix)] in self.words:
+                return True
+        return False
+
+    def suggest(self, word: str, dominance: float = 0):
+        """
+        The closest dictionary word (smallest distance, then most frequent), or None.
+        With `dominance`, a best match that ties on distance with another word is only
+        returned when it is at least that many times more frequent; otherwise None.
+        """
+        word = word.lower()
+        if word in self.words:
+            return word
+        # Short words are only one edit away from too many others
+        limit = 1 if len(word) <= 4 else self.max_edit_distance
+        candidates = set()
+        for variant in self._delete_variants(word[:self.prefix_length]):
+            hit = self.deletes.get(variant)
+            if hit is None:
+                continue
+            candidates.update(hit if isinstance(hit, tuple) else (hit,))
+
+        ranked = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit:
+                ranked.append((distance, -self.words[candidate], candidate))
+        if not ranked:
+            return None
+        ranked.sort()
+        best_distance, best_count, best = ranked[0]
+        if dominance and len(ranked) > 1 and ranked[1][0] == best_distance:
+            if -best_count < dominance * -ranked[1][1]:
+                return None
+        return best
+
+
+def _match_case(original: str, replacement: str) -> str:
+    if original.isupper() and len(original) > 1:
+        return replacement.upper()
+    if original[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+def _drops_inflection(word: str, suggestion: str) -> bool:
+    for ending in INFLECTIONS:
+        if word.endswith(ending):
+            return not suggestion.endswith(ending)
+    return False
+
+
+def grammar_risk(words) -> bool:
+    """
+    True if the (lower-case) words contain something a spell checker can't judge:
+    a homophone, a pronoun followed by a verb that may not agree with it, a bare
+    participle after a subject, or a time word the verb tense has to match.
+    """
+    for index, word in enumerate(words):
+        following = words[index + 1] if index + 1 < len(words) else ""
+        if word in HOMOPHONES or word in TENSE_MARKERS:
+            return True
+        if word == "last" and following in LAST_PERIODS:
+            return True
+        if word in SUBJECTS and following in PARTICIPLES:
+            return True
+        if word in PLURAL_SUBJECTS and following in SINGULAR_VERBS:
+            return True
+        if word == "i" and following in FIRST_PERSON_MISMATCHES:
+            return True
+        if word in SINGULAR_SUBJECTS and following and not (
+            following in SINGULAR_FOLLOWERS or following.endswith(("s", "ed", "ly", "n't", "'s", "'ll", "'d"))
+        ):
+            return True
+    return False
+
+
+def quick_correct(sentence: str, checker: SpellChecker):
+    """
+    Fix a sentence locally when it only needs spelling and simple rule fixes.
+    Returns the corrected sentence, or None if it looks like it needs a real grammar check:
+    an unknown word without a clear suggestion, an unknown word with an apostrophe, an unknown
+    capitalised first word, a suggestion that drops an inflectional ending, a lower-case
+    or object-pronoun start, a repeated word, "a"/"an" before the wrong sound, or any of
+    the agreement, tense or homophone risks in grammar_risk(). Capitalised unknown words
+    later in the sentence are taken to be names and left alone.
+    """
+    words = list(WORD.finditer(sentence))
+    pieces = []
+    position = 0
+    previous = None
+    checked = []
+    for index, match in enumerate(words):
+        token = match.group()
+        lower = token.lower()
+        # A lower-case start may be dialogue after a quote; capitalisation is the LLM's call
+        if index == 0 and (token[0].islower() or lower in OBJECT_PRONOUNS):
+            return None
+        if lower == previous:
+            return None
+        if previous in ("a", "an") and (previous == "a") == (lower[0] in "aeiou"):
+            return None
+
+        if token == "i":
+            fixed = "I"
+        elif checker.is_known(token):
+            fixed = token
+        elif "'" in token or "\u2019" in token:
+            # Never respell around an apostrophe ("can't" is not a typo of "cant")
+            return None
+        elif token[0].isupper():
+            # Probably a name; mid-sentence it stays as written, at the start the LLM decides
+            if index == 0:
+                return None
+            fixed = token
+        else:
+            suggestion = checker.suggest(lower, dominance=AMBIGUITY_RATIO)
+            # Young writers rarely get the first letter wrong; when it changes
+            # ("bestest" -> "fastest") the word is more likely a grammar slip
+            if suggestion is None or suggestion[0] != lower[0] or _drops_inflection(lower, suggestion):
+                return None
+            fixed = _match_case(token, suggestion)
+
+        pieces.append(sentence[position:match.start()])
+        pieces.append(fixed)
+        position = match.end()
+        previous = lower
+        checked.append(fixed.lower().replace("\u2019", "'"))
+    if grammar_risk(checked):
+        return None
+    pieces.append(sentence[position:])
+    return "".join(pieces)
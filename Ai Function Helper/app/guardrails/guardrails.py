@@ -1,16 +1,68 @@
 class Guardrails:
+    # Example guardrail: Block restricted keywords (mock implementation)
+    RESTRICTED_WORDS = ["<unsafe_content>"]
+    BLOCKED_RESPONSE = "I cannot talk about that."
+    EMPTY_RESPONSE = "Thinking..."
+
     def validate_response(self, text: str) -> str:
         """
         Validates and sanitizes the LLM response.
         Enforces safety rules or formatting constraints.
         """
         if not text:
-            return "Thinking..."
+            return self.EMPTY_RESPONSE
         
-        # Example guardrail: Block restricted keywords (mock implementation)
-        restricted_words = ["<unsafe_content>"]
-        for word in restricted_words:
+        for word in self.RESTRICTED_WORDS:
             if word in text:
-                return "I cannot talk about that."
+                return self.BLOCKED_RESPONSE
         
         return text
+
+    def stream_guard(self) -> "StreamGuard":
+        return StreamGuard(self.RESTRICTED_WORDS)
+
+
+class StreamGuard:
+    """
+    Applies the keyword guardrail to a response that arrives in pieces.
+    A tail that could be the start of a restricted word is held back until the
+    next piece arrives, so a word split across two tokens is still caught
+    before any of it is sent. Everything else goes out immediately.
+    """
+    def __init__(self, restricted_words):
+        self.restricted_words = restricted_words
+        self.pending = ""
+        self.blocked = False
+
+    def _held_back(self) -> int:
+        longest = 0
+        for word in self.restricted_words:
+            for size in range(min(len(word) - 1, len(self.pending)), longest, -1):
+                if self.pending.endswith(word[:size]):
+                    longest = size
+                    break
+        return longest
+
+    def feed(self, chunk: str) -> str:
+        """
+        Add a piece of the response; returns the text that is now safe to send.
+        """
+        if self.blocked:
+            return ""
+        self.pending += chunk
+        if any(word in self.pending for word in self.restricted_words):
+            self.blocked = True
+            self.pending = ""
+            return ""
+        cut = len(self.pending) - self._held_back()
+        if cut <= 0:
+            return ""
+        safe, self.pending = self.pending[:cut], self.pending[cut:]
+        return safe
+
+    def finish(self) -> str:
+        """
+        The held-back tail, once the response is complete.
+        """
+        rest, self.pending = ("" if self.blocked else self.pending), ""
+        return rest
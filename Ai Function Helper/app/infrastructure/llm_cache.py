@@ -0,0 +1,170 @@
+"""
+Exact-match cache for LLM responses.
+
+Keys are a SHA-256 of (model, temperature, system prompt, user message), so only
+byte-identical prompts share an answer. Lookups go to an in-process LRU first,
+then to Redis when LLM_CACHE_REDIS_URL is set (shared across workers and
+restarts). Each endpoint has its own TTL; a TTL of 0 turns caching off for it.
+"""
+from collections import Counter, OrderedDict
+import hashlib
+import json
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # Redis tier is optional
+    redis = None
+    aioredis = None
+
+load_dotenv()
+
+# Seconds a cached response stays valid, per endpoint
+CACHE_TTLS = {
+    "chat": int(os.getenv("LLM_CACHE_TTL_CHAT", "600")),
+    "learn": int(os.getenv("LLM_CACHE_TTL_LEARN", str(7 * 24 * 3600))),
+    "grammar": int(os.getenv("LLM_CACHE_TTL_GRAMMAR", str(24 * 3600))),
+}
+DEFAULT_TTL = int(os.getenv("LLM_CACHE_TTL", "3600"))
+MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+REDIS_PREFIX = "llm-cache:"
+
+
+class LLMResponseCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, redis_url: str = None, ttls: dict = None):
+        self.max_entries = max_entries
+        self.ttls = ttls if ttls is not None else CACHE_TTLS
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+        self._redis = None
+        self._aredis = None
+        if redis_url and redis is not None:
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            self._aredis = aioredis.Redis.from_url(redis_url, socket_timeout=0.5)
+        elif redis_url:
+            print("LLM cache: redis package not installed, using the in-process cache only")
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, user_message: str) -> str:
+        raw = json.dumps([model, temperature, system_prompt, user_message], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, endpoint: str) -> int:
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    # --- in-process tier ---
+
+    def _local_get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _local_set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _count(self, endpoint: str, outcome: str):
+        self._counters[(endpoint, outcome)] += 1
+
+    # --- sync API ---
+
+    def get(self, key: str, endpoint: str):
+        if not self.ttl_for(endpoint):
+            return None
+        value = self._local_get(key)
+        if value is not None:
+            self._count(endpoint, "hit")
+            return value
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(REDIS_PREFIX + key)
+            except Exception as e:
+                print(f"LLM cache Redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = raw.decode("utf-8")
+                self._local_set(key, value, self.ttl_for(endpoint))
+                self._count(endpoint, "redis_hit")
+                return value
+        self._count(endpoint, "miss")
+        return None
+
+    def set(self, key: str, value: str, endpoint: str):
+        ttl = self.ttl_for(endpoint)
+        if not ttl or not value:
+            return
+        self._local_set(key, value, ttl)
+        if self._redis is not None:
+            try:
+                self._redis.set(REDIS_PREFIX + key, value, ex=ttl)
+            except Exception as e:
+                print(f"LLM cache Redis write failed: {e}")
+
+    # --- async API (same tiers, non-blocking Redis) ---
+
+    async def aget(self, key: str, endpoint: str):
+        if not self.ttl_for(endpoint):
+            return None
+        value = self._local_get(key)
+        if value is not None:
+            self._count(endpoint, "hit")
+            return value
+        if self._aredis is not None:
+            try:
+                raw = await self._aredis.get(REDIS_PREFIX + key)
+            except Exception as e:
+                print(f"LLM cache Redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                value = raw.decode("utf-8")
+                self._local_set(key, value, self.ttl_for(endpoint))
+                self._count(endpoint, "redis_hit")
+                return value
+        self._count(endpoint, "miss")
+        return None
+
+    async def aset(self, key: str, value: str, endpoint: str):
+        ttl = self.ttl_for(endpoint)
+        if not ttl or not value:
+            return
+        self._local_set(key, value, ttl)
+        if self._aredis is not None:
+            try:
+                await self._aredis.set(REDIS_PREFIX + key, value, ex=ttl)
+            except Exception as e:
+                print(f"LLM cache Redis write failed: {e}")
+
+    def stats(self) -> dict:
+        endpoints = {}
+        for (endpoint, outcome), count in self._counters.items():
+            endpoints.setdefault(endpoint, {"hit": 0, "redis_hit": 0, "miss": 0})[outcome] = count
+        for counts in endpoints.values():
+            lookups = counts["hit"] + counts["redis_hit"] + counts["miss"]
+            counts["hit_rate"] = round((counts["hit"] + counts["redis_hit"]) / lookups, 3) if lookups else 0.0
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "redis": self._redis is not None,
+            "ttls": self.ttls,
+            "endpoints": endpoints,
+        }
+
+
+llm_cache = LLMResponseCache(redis_url=os.getenv("LLM_CACHE_REDIS_URL"))
@@ -3,37 +3,106 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from dotenv import load_dotenv
 import os
 
+from app.infrastructure.llm_cache import LLMResponseCache, llm_cache
+
 load_dotenv()
 
+FALLBACK_RESPONSE = "I'm sorry, I'm having trouble connecting to my brain right now."
+
 class LLMClient:
-    def __init__(self):
+    def __init__(self, cache: LLMResponseCache = None):
         # Initialize LangChain ChatOpenAI
         # Ensure OPENAI_API_KEY is in env
+        self.model = "gpt-4.1-nano"
+        self.temperature = 0.4
         self.chat = ChatOpenAI(
-            model="gpt-4.1-nano",
-            temperature=0.4
+            model=self.model,
+            temperature=self.temperature
         )
+        # Identical prompts get the stored answer instead of a new API call
+        self.cache = cache or llm_cache
 
-    def generate_chat_response(self, system_prompt: str, user_message: str) -> str:
-        """
-        Generates a response from the LLM based on system and user prompts.
-        """
-        messages = [
+    def _messages(self, system_prompt: str, user_message: str) -> list:
+        return [
             SystemMessage(content=system_prompt),
             HumanMessage(content=user_message)
         ]
-        
+
+    def _cache_key(self, system_prompt: str, user_message: str) -> str:
+        return self.cache.make_key(self.model, self.temperature, system_prompt, user_message)
+
+    def generate_chat_response(self, system_prompt: str, user_message: str, endpoint: str = "chat") -> str:
+        """
+        Generates a response from the LLM based on system and user prompts.
+        Blocking; the API endpoints use agenerate_chat_response instead.
+        `endpoint` picks the cache TTL (see llm_cache.CACHE_TTLS).
+        """
+        key = self._cache_key(system_prompt, user_message)
+        cached = self.cache.get(key, endpoint)
+        if cached is not None:
+            return cached
+
         try:
-            response = self.chat.invoke(messages)
-            return response.content
+            response = self.chat.invoke(self._messages(system_prompt, user_message))
         except Exception as e:
             # Basic error handling
             print(f"LLM Error: {e}")
-            return "I'm sorry, I'm having trouble connecting to my brain right now."
+            return FALLBACK_RESPONSE
+        self.cache.set(key, response.content, endpoint)
+        return response.content
+
+    async def agenerate_chat_response(self, system_prompt: str, user_message: str, endpoint: str = "chat") -> str:
+        """
+        Async version of generate_chat_response. Awaits the HTTP call instead of
+        holding a worker thread, so one event loop can serve many requests at once.
+        """
+        key = self._cache_key(system_prompt, user_message)
+        cached = await self.cache.aget(key, endpoint)
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.chat.ainvoke(self._messages(system_prompt, user_message))
+        except Exception as e:
+            print(f"LLM Error: {e}")
+            return FALLBACK_RESPONSE
+        await self.cache.aset(key, response.content, endpoint)
+        return response.content
+
+    async def astream_chat_response(self, system_prompt: str, user_message: str, endpoint: str = "chat"):
+        """
+        Yields the response text piece by piece as the model produces it.
+        A cached response is yielded in one piece; a completed stream is cached.
+        """
+        key = self._cache_key(system_prompt, user_message)
+        cached = await self.cache.aget(key, endpoint)
+        if cached is not None:
+            yield cached
+            return
+
+        pieces = []
+        try:
+            async for chunk in self.chat.astream(self._messages(system_prompt, user_message)):
+                if chunk.content:
+                    pieces.append(chunk.content)
+                    yield chunk.content
+        except Exception as e:
+            print(f"LLM Error: {e}")
+            if not pieces:
+                yield FALLBACK_RESPONSE
+            return
+        await self.cache.aset(key, "".join(pieces), endpoint)
+
+    def _description_prompt(self, text: str) -> str:
+        return f"Provide a very brief (one sentence) categorization or description of this text: '{text}'"
 
     def generate_description(self, text: str) -> str:
         """
         Asks LLM to generate a short metadata description/explanation.
         """
-        prompt = f"Provide a very brief (one sentence) categorization or description of this text: '{text}'"
-        return self.generate_chat_response("You are a metadata assistant.", prompt)
+        return self.generate_chat_response("You are a metadata assistant.", self._description_prompt(text), endpoint="learn")
+
+    async def agenerate_description(self, text: str) -> str:
+        return await self.agenerate_chat_response(
+            "You are a metadata assistant.", self._description_prompt(text), endpoint="learn"
+        )
@@ -0,0 +1,138 @@
+"""
+Content-addressed disk cache for synthesized audio.
+
+A clip is stored under the SHA-256 of (voice, model version, text), so the same
+word in the same voice is synthesized once and then read back from disk. The
+directory is bounded by total size: the least recently used clips (by file
+mtime, which hits refresh) are evicted first.
+"""
+from collections import OrderedDict
+from importlib import metadata
+import hashlib
+import os
+import threading
+
+CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")
+MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+
+def model_version() -> str:
+    """
+    Pocket TTS package version (or TTS_MODEL_VERSION), so an upgrade doesn't serve old audio.
+    """
+    override = os.getenv("TTS_MODEL_VERSION")
+    if override:
+        return override
+    try:
+        return metadata.version("pocket-tts")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class TTSAudioCache:
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._files = OrderedDict()  # key -> size, least recently used first
+        self._total = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        self._scan()
+
+    @staticmethod
+    def make_key(voice: str, version: str, text: str) -> str:
+        return hashlib.sha256(f"{voice}|{version}|{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.wav")
+
+    def _scan(self):
+        """
+        Rebuild the LRU order from what is already on disk (oldest mtime first).
+        """
+        found = []
+        if os.path.isdir(self.directory):
+            for root, _, names in os.walk(self.directory):
+                for name in names:
+                    if not name.endswith(".wav"):
+                        continue
+                    stat = os.stat(os.path.join(root, name))
+                    found.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._files[key] = size
+            self._total += size
+
+    def get(self, key: str):
+        path = self._path(key)
+        with self._lock:
+            known = key in self._files
+            if known:
+                self._files.move_to_end(key)
+        if not known and not self._adopt(key, path):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            with self._lock:
+                self._total -= self._files.pop(key, 0)
+            return None
+
+    def _adopt(self, key: str, path: str) -> bool:
+        """
+        Another worker process may have written the clip since our scan: index it.
+        """
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        with self._lock:
+            self._total += size - self._files.pop(key, 0)
+            self._files[key] = size
+        return True
+
+    def set(self, key: str, data: bytes):
+        if not data or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename, so a reader never sees a half-written clip
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"TTS cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._total += len(data) - self._files.pop(key, 0)
+            self._files[key] = len(data)
+            evicted = []
+            while self._total > self.max_bytes:
+                old_key, size = self._files.popitem(last=False)
+                self._total -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "hit": self._hits,
+                "miss": self._misses,
+            }
@@ -1,51 +1,153 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
 from pocket_tts import TTSModel
 import scipy.io.wavfile
 import torch
+import asyncio
+import multiprocessing
 import os
 
+from app.infrastructure.tts_cache import TTSAudioCache, model_version
+
+# Synthesis is CPU-bound, so it runs in its own worker processes (each with its own
+# copy of the model) instead of competing with the event loop for the GIL
+TTS_WORKERS = int(os.getenv("TTS_WORKERS", "1"))
+# Synthesis jobs allowed in flight (running + waiting); past that, audio is skipped
+TTS_QUEUE_SIZE = int(os.getenv("TTS_QUEUE_SIZE", "8"))
+
+TTS_VOICE = "alba"
+WARMUP_TEXT = "Hello there."
+
+# --- Worker process side ---
+# Each worker loads the model once, in the pool initializer, and keeps it here.
+_tts_model = None
+_voice_state = None
+
+def _load_model():
+    """
+    Pool initializer: load Pocket TTS and run one dummy utterance, since the
+    first generation is much slower than the ones after it.
+    """
+    global _tts_model, _voice_state
+    print("Loading Pocket TTS model...")
+    try:
+        _tts_model = TTSModel.load_model()
+        _voice_state = _tts_model.get_state_for_audio_prompt(TTS_VOICE)
+        _tts_model.generate_audio(_voice_state, WARMUP_TEXT)
+        print("Pocket TTS model loaded and warmed up.")
+    except Exception as e:
+        print(f"Failed to initialize Pocket TTS: {e}")
+        _tts_model = None
+
+def _is_loaded() -> bool:
+    return _tts_model is not None
+
+def _synthesize(text: str) -> bytes:
+    if not text or not _tts_model:
+        return b""
+
+    try:
+        # Generate audio tensor
+        audio_tensor = _tts_model.generate_audio(_voice_state, text)
+
+        # Convert to bytes
+        fp = BytesIO()
+        # Write wav to memory buffer.
+        # audio_tensor is a torch tensor, we need numpy array for scipy
+        scipy.io.wavfile.write(fp, _tts_model.sample_rate, audio_tensor.numpy())
+        fp.seek(0)
+
+        return fp.read()
+
+    except Exception as e:
+        print(f"TTS Generation Error: {e}")
+        return b""
+
+# --- API process side ---
+
 class TTSClient:
     def __init__(self):
         """
-        Initialize the Pocket TTS model.
+        Set up the TTS worker pool. Workers load the model when they start;
+        call warm_up() at startup so that happens before the first request.
         """
-        self.tts_model = None
-        self.voice_state = None
+        self.executor = self._new_executor()
+        self.slots = asyncio.Semaphore(TTS_QUEUE_SIZE)
+        self.cache = TTSAudioCache()
+        self.model_version = model_version()
+        self.status = "loading"  # loading -> ready | failed
 
-    def _ensure_model_loaded(self):
-        if not self.tts_model:
-            print("Loading Pocket TTS model...")
-            try:
-                self.tts_model = TTSModel.load_model()
-                self.voice_state = self.tts_model.get_state_for_audio_prompt("alba")
-                print("Pocket TTS model loaded successfully.")
-            except Exception as e:
-                print(f"Failed to initialize Pocket TTS: {e}")
-                self.tts_model = None
+    @staticmethod
+    def _new_executor() -> ProcessPoolExecutor:
+        # "spawn" so workers don't inherit the server's event loop and threads
+        return ProcessPoolExecutor(
+            max_workers=TTS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_load_model,
+        )
 
-    def text_to_speech(self, text: str) -> bytes:
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    async def warm_up(self):
         """
-        Converts text to speech audio bytes using Pocket TTS.
-        returns: WAV file bytes
+        Start every worker (loading and warming its model) and record whether they all made it.
         """
-        self._ensure_model_loaded()
-        
-        if not text or not self.tts_model:
-            return b""
-            
+        loop = asyncio.get_running_loop()
         try:
-            # Generate audio tensor
-            audio_tensor = self.tts_model.generate_audio(self.voice_state, text)
-            
-            # Convert to bytes
-            fp = BytesIO()
-            # Write wav to memory buffer. 
-            # audio_tensor is a torch tensor, we need numpy array for scipy
-            scipy.io.wavfile.write(fp, self.tts_model.sample_rate, audio_tensor.numpy())
-            fp.seek(0)
-            
-            return fp.read()
-            
+            loaded = await asyncio.gather(
+                *(loop.run_in_executor(self.executor, _is_loaded) for _ in range(TTS_WORKERS))
+            )
+            self.status = "ready" if all(loaded) else "failed"
         except Exception as e:
-            print(f"TTS Generation Error: {e}")
+            print(f"TTS warmup failed: {e}")
+            self.status = "failed"
+
+    def _restart_pool(self, broken: ProcessPoolExecutor):
+        """
+        A worker died (OOM, crash in torch) and took the pool down with it: every later
+        submit would fail. Start a fresh pool and warm it; /health is 503 until it is ready.
+        """
+        if broken is not self.executor:
+            return  # another request already replaced it
+        print("TTS worker pool broke, restarting it")
+        self.status = "loading"
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.executor = self._new_executor()
+        self._rewarm = asyncio.get_running_loop().create_task(self.warm_up())
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cache_key(self, text: str) -> str:
+        return self.cache.make_key(TTS_VOICE, self.model_version, text)
+
+    async def atext_to_speech(self, text: str) -> bytes:
+        """
+        Returns cached audio for text already synthesized, otherwise runs synthesis on the
+        worker pool without blocking the event loop.
+        When the queue is full the request gets no audio rather than waiting behind it.
+        """
+        if not text:
             return b""
+        key = self._cache_key(text)
+        audio = await asyncio.to_thread(self.cache.get, key)
+        if audio is not None:
+            return audio
+
+        if self.slots.locked():
+            print("TTS queue full, skipping synthesis")
+            return b""
+        async with self.slots:
+            loop = asyncio.get_running_loop()
+            executor = self.executor
+            try:
+                audio = await loop.run_in_executor(executor, _synthesize, text)
+            except BrokenProcessPool as e:
+                print(f"TTS Generation Error: {e}")
+                self._restart_pool(executor)
+                return b""
+        await asyncio.to_thread(self.cache.set, key, audio)
+        return audio
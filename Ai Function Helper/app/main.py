@@ -1,4 +1,8 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
+import asyncio
+import json
 from app.models.schemas import (
     ChatRequest, ChatResponse,
     LearnRequest, LearnResponse,
@@ -7,53 +11,123 @@ from app.models.schemas import (
 )
 from app.application.orchestrator import Orchestrator
 
-app = FastAPI(title="Cindy - Voice Chat Assistant")
-
 # Dependency Injection (Singleton for simplicity here)
 orchestrator = Orchestrator()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load and warm the TTS model in the background so the server can answer
+    # /health (not ready yet) meanwhile, instead of the first /learn call paying for it
+    warmup = asyncio.create_task(orchestrator.tts_client.warm_up())
+    yield
+    warmup.cancel()
+    orchestrator.tts_client.close()
+
+app = FastAPI(title="Cindy - Voice Chat Assistant", lifespan=lifespan)
+
 @app.post("/chat", response_model=ChatResponse)
-def chat_endpoint(request: ChatRequest):
+async def chat_endpoint(request: ChatRequest):
     """
     Chatbot endpoint. 
     Receives text message + history, returns conversational response (and optionally audio).
     """
     try:
-        response = orchestrator.handle_chat_request(request)
+        response = await orchestrator.handle_chat_request(request)
         return response
     except Exception as e:
         print(f"Error processing chat request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest):
+    """
+    Streaming chatbot endpoint (Server-Sent Events).
+    Emits `token` events as the response is generated, `replace` if a guardrail
+    rewrites it, and a final `done` event with the complete text.
+    """
+    async def events():
+        try:
+            async for event, text in orchestrator.stream_chat_request(request):
+                yield format_sse(event, {"text": text})
+        except Exception as e:
+            print(f"Error streaming chat request: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/chat/speech/stream")
+async def chat_speech_stream_endpoint(request: ChatRequest):
+    """
+    Streaming chatbot endpoint with speech (Server-Sent Events).
+    Same text events as /chat/stream, plus one `audio` event per sentence
+    ({index, text, audio: base64 WAV}) as soon as it is synthesized.
+    """
+    async def events():
+        try:
+            async for event, data in orchestrator.stream_chat_speech(request):
+                yield format_sse(event, data)
+        except Exception as e:
+            print(f"Error streaming chat speech: {e}")
+            yield format_sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.post("/learn", response_model=LearnResponse)
-def learn_endpoint(request: LearnRequest):
+async def learn_endpoint(request: LearnRequest):
     """
     Pronunciation and Word Description endpoint.
     Receives a word, returns its description/definition and TTS pronunciation.
     """
     try:
-        response = orchestrator.handle_learn_request(request)
+        response = await orchestrator.handle_learn_request(request)
         return response
     except Exception as e:
         print(f"Error processing learn request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/grammar", response_model=GrammarResponse)
-def grammar_endpoint(request: GrammarRequest):
+async def grammar_endpoint(request: GrammarRequest):
     """
     Grammar Correction endpoint.
     Receives text, returns the grammatically corrected version.
     """
     try:
-        response = orchestrator.handle_grammar_request(request)
+        response = await orchestrator.handle_grammar_request(request)
         return response
     except Exception as e:
         print(f"Error processing grammar request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
-async def health_check():
-    return {"status": "ok"}
+async def health_check(response: Response):
+    """
+    Ready (200) only once the TTS model is loaded and warm; 503 while loading or if it failed.
+    """
+    tts_status = orchestrator.tts_client.status
+    if tts_status != "ready":
+        response.status_code = 503
+        return {"status": "starting" if tts_status == "loading" else "unavailable", "tts": tts_status}
+    return {"status": "ok", "tts": tts_status}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    LLM response cache size and hit/miss counts per endpoint, plus the TTS audio cache.
+    """
+    stats = orchestrator.llm_client.cache.stats()
+    stats["tts_audio"] = orchestrator.tts_client.cache.stats()
+    return stats
 
 # --- Settings Endpoints ---
 
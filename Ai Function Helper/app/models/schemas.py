@@ -27,8 +27,15 @@ class LearnResponse(BaseModel):
 class GrammarRequest(BaseModel):
     text: str = Field(..., description="Text to check/correct")
 
+class GrammarEdit(BaseModel):
+    offset: int = Field(..., description="Start of the span in the original text (character index)")
+    length: int = Field(..., description="Number of original characters replaced (0 for an insertion)")
+    replacement: str = Field(..., description="Text that replaces the span")
+    category: str = Field(..., description="spelling, grammar, punctuation or capitalization")
+
 class GrammarResponse(BaseModel):
     corrected_text: str = Field(..., description="Grammatically corrected text")
+    edits: List[GrammarEdit] = Field(default_factory=list, description="Word-level edits that turn the input into corrected_text")
 
 # --- Configuration Models ---
 class AssistantConfig(BaseModel):
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import sys
+from unittest.mock import MagicMock
+
+# Mock external dependencies to allow tests to run without installing them
+sys.modules.setdefault("langchain_openai", MagicMock())
+sys.modules.setdefault("langchain_core.messages", MagicMock())
+sys.modules.setdefault("dotenv", MagicMock())
+
+from app.domain.grammar.diff import apply_edits, compute_edits
+from app.domain.grammar.grammar_service import (SENTENCE_BATCH_PROMPT, GrammarService,
+                                                join_sentences, split_sentences)
+from app.domain.grammar.spellcheck import SpellChecker, quick_correct
+
+
+def test_split_sentences_round_trips():
+    text = 'Me go home. "Really?" she asked!\n\nI dont know.  Yes'
+    sentences, separators = split_sentences(text)
+
+    assert sentences == ["Me go home.", '"Really?"', "she asked!", "I dont know.", "Yes"]
+    assert join_sentences(sentences, separators) == text
+
+
+class StubCache:
+    def __init__(self):
+        self.values = {}
+
+    @staticmethod
+    def make_key(*parts):
+        return repr(parts)
+
+    async def aget(self, key, endpoint):
+        return self.values.get(key)
+
+    async def aset(self, key, value, endpoint):
+        self.values[key] = value
+
+
+class StubLLM:
+    model = "stub"
+    temperature = 0
+
+    def __init__(self):
+        self.cache = StubCache()
+        self.calls = []
+
+    async def agenerate_chat_response(self, system_prompt, user_message, endpoint="chat"):
+        self.calls.append((system_prompt, user_message))
+        sentences = json.loads(user_message)
+        return json.dumps([sentence.replace("goed", "went") for sentence in sentences])
+
+
+def test_correct_grammar_batches_only_unseen_sentences():
+    llm = StubLLM()
+    # An empty dictionary knows no word, so the spell-check fast path never answers
+    service = GrammarService(llm, spell_checker=SpellChecker())
+
+    first = asyncio.run(service.correct_grammar("We goed home. It was late.\nWe goed home."))
+    assert first == "We went home. It was late.\nWe went home."
+    assert llm.calls == [(SENTENCE_BATCH_PROMPT, json.dumps(["We goed home.", "It was late."]))]
+
+    # Only the new sentence is sent; the others come from the cache and keep their places
+    llm.calls.clear()
+    second = asyncio.run(service.correct_grammar("It was late.  They goed out. We goed home."))
+    assert second == "It was late.  They went out. We went home."
+    assert llm.calls == [(SENTENCE_BATCH_PROMPT, json.dumps(["They goed out."]))]
+
+
+class FencedLLM(StubLLM):
+    async def agenerate_chat_response(self, system_prompt, user_message, endpoint="chat"):
+        reply = await super().agenerate_chat_response(system_prompt, user_message, endpoint)
+        return f"Here are the corrected sentences:\n```json\n{reply}\n```\nLet me know if you need more."
+
+
+def test_correct_grammar_reads_a_fenced_batch_reply():
+    llm = FencedLLM()
+    service = GrammarService(llm, spell_checker=SpellChecker())
+
+    assert asyncio.run(service.correct_grammar("We goed home. It was late.")) == "We went home. It was late."
+    # One batch call: the fenced reply didn't force the whole-text fallback
+    assert len(llm.calls) == 1
+
+
+def test_compute_edits_reproduces_the_correction():
+    original = "me go to the the store yesterday"
+    corrected = "I went to the store yesterday."
+    edits = compute_edits(original, corrected)
+
+    assert apply_edits(original, edits) == corrected
+    assert [edit["category"] for edit in edits] == ["grammar", "grammar", "punctuation"]
+    assert compute_edits(corrected, corrected) == []
+
+
+def test_quick_correct_only_fixes_clear_misspellings():
+    checker = SpellChecker()
+    for word, count in [("my", 900), ("friend", 500), ("has", 800), ("a", 1000),
+                        ("dragon", 50), ("the", 1000), ("park", 100), ("part", 120)]:
+        checker.add_word(word, count)
+
+    assert quick_correct("My frend Mia has a dragon.", checker) == "My friend Mia has a dragon."
+    # "parc" is as close to "park" as to "part": leave it to the LLM
+    assert quick_correct("My friend has the parc.", checker) is None
+    assert quick_correct("My friend has a a dragon.", checker) is None
+
+
+def test_quick_correct_keeps_contractions():
+    checker = SpellChecker()
+    for word, count in [("we", 900), ("cant", 50), ("stop", 300), ("now", 700),
+                        ("i", 1000), ("wont", 20), ("go", 800), ("do", 900)]:
+        checker.add_word(word, count)
+
+    assert quick_correct("We can't stop now.", checker) == "We can't stop now."
+    assert quick_correct("I won\u2019t go.", checker) == "I won\u2019t go."
+    assert quick_correct("We don't stop.", checker) == "We don't stop."
+    # An apostrophe word the checker doesn't know is left to the LLM, not respelled
+    assert quick_correct("We cn't stop.", checker) is None
+
+
+def test_quick_correct_never_drops_an_inflection():
+    checker = SpellChecker()
+    for word, count in [("the", 1000), ("child", 400), ("played", 300),
+                        ("dog", 300), ("jump", 200), ("high", 300)]:
+        checker.add_word(word, count)
+
+    # Each is one edit from a known word, but the fix is a different form, not a spelling
+    assert quick_correct("The childs played.", checker) is None
+    assert quick_correct("The dog jumpd high.", checker) is None
+
+
+def test_quick_correct_leaves_grammar_risks_to_the_llm():
+    checker = SpellChecker()
+    for word, count in [("we", 900), ("was", 900), ("happy", 300), ("he", 900), ("go", 800),
+                        ("to", 1000), ("school", 300), ("yesterday", 100), ("i", 1000),
+                        ("seen", 200), ("a", 1000), ("bird", 100), ("their", 500),
+                        ("going", 400), ("home", 400), ("it", 900), ("late", 200)]:
+        checker.add_word(word, count)
+
+    # Every word is spelled right; each sentence still needs a grammar check
+    for sentence in ["We was happy.", "He go to school yesterday.", "I seen a bird.", "Their going home."]:
+        assert quick_correct(sentence, checker) is None, sentence
+    assert quick_correct("It was late.", checker) == "It was late."
@@ -0,0 +1,81 @@
+import asyncio
+import sys
+from unittest.mock import MagicMock
+
+# Mock external dependencies to allow tests to run without installing them
+for module in ("langchain_openai", "langchain_core.messages", "dotenv",
+               "pocket_tts", "scipy", "scipy.io", "scipy.io.wavfile", "torch"):
+    sys.modules.setdefault(module, MagicMock())
+
+from app.application.orchestrator import SPEECH_LOOKAHEAD, Orchestrator
+
+
+class FakeTTS:
+    def __init__(self, delays):
+        self.delays = delays
+        self.inflight = 0
+        self.max_inflight = 0
+        self.cancelled = []
+
+    async def atext_to_speech(self, text):
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(self.delays.get(text, 0.01))
+            return text.encode()
+        except asyncio.CancelledError:
+            self.cancelled.append(text)
+            raise
+        finally:
+            self.inflight -= 1
+
+
+def make_orchestrator(events, tts):
+    # Only the streaming pieces are needed, not the real services
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.tts_client = tts
+
+    async def stream_chat_request(request):
+        for event in events:
+            await asyncio.sleep(0.01)
+            yield event
+
+    orchestrator.stream_chat_request = stream_chat_request
+    return orchestrator
+
+
+def collect(orchestrator):
+    async def run():
+        return [event async for event in orchestrator.stream_chat_speech(None)]
+    return asyncio.run(run())
+
+
+def test_audio_arrives_in_order_with_bounded_lookahead():
+    tts = FakeTTS({"One.": 0.1})  # the first sentence is the slowest to synthesize
+    events = [
+        ("token", "One. Two. Thr"),
+        ("token", "ee! Four? Fi"),
+        ("token", "ve."),
+        ("done", "One. Two. Three! Four? Five."),
+    ]
+    audio = [data for event, data in collect(make_orchestrator(events, tts)) if event == "audio"]
+
+    assert [item["index"] for item in audio] == [0, 1, 2, 3, 4]
+    assert [item["text"] for item in audio] == ["One.", "Two.", "Three!", "Four?", "Five."]
+    assert tts.max_inflight <= SPEECH_LOOKAHEAD
+
+
+def test_replace_cancels_pending_audio_and_speaks_the_replacement():
+    tts = FakeTTS({"One.": 0.5, "Two.": 0.5})
+    replacement = "Let's talk. About owls."
+    events = [
+        ("token", "One. Two. Thr"),
+        ("replace", replacement),
+        ("done", replacement),
+    ]
+    streamed = collect(make_orchestrator(events, tts))
+    audio = [data for event, data in streamed if event == "audio"]
+
+    assert sorted(tts.cancelled) == ["One.", "Two."]
+    assert [(item["index"], item["text"]) for item in audio] == [(0, "Let's talk."), (1, "About owls.")]
+    assert [event for event, _ in streamed][:3] == ["token", "replace", "done"]
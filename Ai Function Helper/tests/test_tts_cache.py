@@ -0,0 +1,22 @@
+from app.infrastructure.tts_cache import TTSAudioCache
+
+
+def test_get_adopts_clip_written_by_another_worker(tmp_path):
+    mine = TTSAudioCache(directory=str(tmp_path), max_bytes=1024)
+    other = TTSAudioCache(directory=str(tmp_path), max_bytes=1024)
+    key = TTSAudioCache.make_key("alba", "1", "hello")
+
+    other.set(key, b"RIFFaudio")
+
+    assert mine.get(key) == b"RIFFaudio"
+    stats = mine.stats()
+    assert stats["files"] == 1
+    assert stats["bytes"] == len(b"RIFFaudio")
+    assert stats["hit"] == 1
+
+
+def test_get_misses_when_clip_is_nowhere(tmp_path):
+    cache = TTSAudioCache(directory=str(tmp_path), max_bytes=1024)
+
+    assert cache.get(TTSAudioCache.make_key("alba", "1", "missing")) is None
+    assert cache.stats()["miss"] == 1
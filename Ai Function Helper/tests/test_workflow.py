@@ -1,53 +1,53 @@
-import pytest
-from unittest.mock import MagicMock, patch
+import asyncio
+import base64
 import sys
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Mock external dependencies to allow tests to run without installing them
-sys.modules["langchain_openai"] = MagicMock()
-sys.modules["langchain_core.messages"] = MagicMock()
-sys.modules["dotenv"] = MagicMock()
-sys.modules["pocket_tts"] = MagicMock()
-sys.modules["scipy"] = MagicMock()
-sys.modules["scipy.io"] = MagicMock()
-sys.modules["scipy.io.wavfile"] = MagicMock()
-sys.modules["torch"] = MagicMock()
-
-from app.models.schemas import ChatRequest, ChatResponse
+for module in ("langchain_openai", "langchain_core.messages", "dotenv",
+               "pocket_tts", "scipy", "scipy.io", "scipy.io.wavfile", "torch"):
+    sys.modules.setdefault(module, MagicMock())
+
+from app.models.schemas import ChatRequest, ChatResponse, LearnRequest, LearnResponse
 from app.application.orchestrator import Orchestrator
 
 # Mock the external services to avoid actual API calls during tests
-# We must patch where the class is USED, not where it is defined, 
+# We must patch where the class is USED, not where it is defined,
 # because Orchestrator imports it directly.
+@patch("app.application.orchestrator.JsonConfigService")
 @patch("app.application.orchestrator.LLMClient")
 @patch("app.application.orchestrator.TTSClient")
-def test_full_workflow(MockTTS, MockLLM):
+def test_full_workflow(MockTTS, MockLLM, MockConfig):
     # Setup Mocks
     mock_llm_instance = MockLLM.return_value
-    mock_llm_instance.generate_chat_response.return_value = "Hello user!"
-    mock_llm_instance.generate_description.return_value = "A greeting."
-    
+    mock_llm_instance.agenerate_chat_response = AsyncMock(return_value="Hello user!")
+    mock_llm_instance.agenerate_description = AsyncMock(return_value="A greeting.")
+
     mock_tts_instance = MockTTS.return_value
-    mock_tts_instance.text_to_speech.return_value = b"fake_audio_bytes"
+    mock_tts_instance.atext_to_speech = AsyncMock(return_value=b"fake_audio_bytes")
+
+    MockConfig.return_value.get_config.return_value.behavior_settings = "Be friendly."
 
     # Initialize Orchestrator (it will use the mocked classes because of patch)
     orchestrator = Orchestrator()
-    
-    # Define Request
-    request = ChatRequest(
-        word="Hello",
-        conversation_history=["User: Hi"]
-    )
-    
-    # Execute Flow
-    response = orchestrator.process_request(request)
-    
-    # Verify Orchestrator Logic
-    assert isinstance(response, ChatResponse)
-    assert response.chat_response == "Hello user!"
-    assert response.description == "A greeting."
-    assert response.speech_output == b"fake_audio_bytes"
-    
+
+    # Chat: LLM reply through the guardrails
+    chat = asyncio.run(orchestrator.handle_chat_request(
+        ChatRequest(message="Hello", conversation_history=["User: Hi"])
+    ))
+    assert isinstance(chat, ChatResponse)
+    assert chat.chat_response == "Hello user!"
+    system_prompt, user_message = mock_llm_instance.agenerate_chat_response.call_args.args
+    assert "Be friendly." in system_prompt
+    assert user_message.endswith("User: Hello")
+
+    # Learn: description and pronunciation together
+    learn = asyncio.run(orchestrator.handle_learn_request(LearnRequest(word="Hello")))
+    assert isinstance(learn, LearnResponse)
+    assert learn.description == "A greeting."
+    assert base64.b64decode(learn.pronunciation_audio) == b"fake_audio_bytes"
+
     # Verify Infrastructure interactions
-    mock_llm_instance.generate_chat_response.assert_called_once()
-    mock_tts_instance.text_to_speech.assert_called_once_with("Hello user!")
-    mock_llm_instance.generate_description.assert_called_once()     
+    mock_llm_instance.agenerate_chat_response.assert_awaited_once()
+    mock_llm_instance.agenerate_description.assert_awaited_once_with("Hello")
+    mock_tts_instance.atext_to_speech.assert_awaited_once_with("Hello")
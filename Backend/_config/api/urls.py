@@ -44,11 +44,21 @@ STUDENT_PATTERN = [
 
 ADMIN_PATTERN = [
     path("overview/",admin.AdminDashboardView.as_view(),name="adminOverview"),
+    path("activity/",admin.ActivityFeedAPIView.as_view(),name="activity-feed"),
     #
     path('admin/students/', admin.StudentListCreateAPIView.as_view(), name='student-list-create'),
+    path('admin/students/import/', admin.StudentRosterImportAPIView.as_view(), name='student-import'),
     path('admin/students/<int:pk>/', admin.StudentDetailAPIView.as_view(), name='student-detail'),
+    path('admin/students/bulk-update/', admin.StudentBulkUpdateAPIView.as_view(), name='student-bulk-update'),
+    path('admin/students/recommend/', admin.BulkRecommendationAPIView.as_view(), name='student-bulk-recommend'),
+    path('admin/students/<int:pk>/dictionary-history/', admin.StudentDictionaryHistoryAPIView.as_view(), name='student-dictionary-history'),
     path('admin/students/<int:pk>/recommend/', admin.StudentRecommendationAPIView.as_view(), name='student-recommend'),
     #
+    path('export/students/', admin.StudentExportAPIView.as_view(), name='export-students'),
+    path('export/activity/', admin.ActivityExportAPIView.as_view(), name='export-activity'),
+    #
+    path('vocabulary/trending/', admin.TrendingVocabularyAPIView.as_view(), name='vocabulary-trending'),
+    #
     path('admin/teachers/', admin.TeacherListCreateAPIView.as_view(), name='teacher-list-create'),
     path('admin/teachers/<int:pk>/', admin.TeacherDetailAPIView.as_view(), name='teacher-detail'),
     #
@@ -61,11 +71,20 @@ ADMIN_PATTERN = [
 
 TEACHER_PATTERN = [
     path("dashboard/",teachers.TeacherDashboardAPIView.as_view(),name="teacher-dashboard"),
+    path("dashboard/stream/",teachers.TeacherActivityStreamView.as_view(),name="teacher-dashboard-stream"),
     #
     path('all/students/', teachers.TeacherStudentListCreateAPIView.as_view(), name='teacher-student-list'),
+    path('students/import/', teachers.TeacherStudentRosterImportAPIView.as_view(), name='teacher-student-import'),
     path('students/<int:pk>/action/', teachers.TeacherStudentDetailAPIView.as_view(), name='teacher-student-detail'),
+    path('students/recommend/', teachers.TeacherBulkRecommendationAPIView.as_view(), name='teacher-bulk-recommend'),
     path('students/<int:pk>/recommend/', teachers.TeacherStudentRecommendationAPIView.as_view(), name='teacher-recommend'),
     #
+    path('vocabulary/trending/', admin.TrendingVocabularyAPIView.as_view(), name='teacher-vocabulary-trending'),
+    #
+    path('classrooms/', teachers.ClassroomListCreateAPIView.as_view(), name='classroom-list-create'),
+    path('classrooms/<int:pk>/', teachers.ClassroomDetailAPIView.as_view(), name='classroom-detail'),
+    path('classrooms/<int:pk>/members/', teachers.ClassroomMembersAPIView.as_view(), name='classroom-members'),
+    #
     path('my-profile/', teachers.TeacherMyProfileAPIView.as_view(), name='teacher-self-profile'),
     #
     path('get/terms-and-conditions/',admin.TermsAPIView.as_view(),name="Term-and-conditions"),
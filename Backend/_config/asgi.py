@@ -2,6 +2,9 @@
 ASGI config for _config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with ``uvicorn _config.asgi:application``; the teacher activity stream
+(Server-Sent Events) needs an ASGI server to hold connections open without
+tying up a worker thread each.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -14,3 +17,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', '_config.settings')
 
 application = get_asgi_application()
+
+from django.conf import settings
+
+if settings.DEBUG:
+    # runserver serves static files itself; do the same when developing under uvicorn
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+    application = ASGIStaticFilesHandler(application)
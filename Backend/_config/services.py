@@ -1,8 +1,15 @@
+from datetime import timedelta
+
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 
+from app.accounts.models import OutboundEmail
 
-def send_welcome_email(user, password, role):
+
+def _welcome_message(user, password, role):
     subject = f"Welcome to the Platform - Your {role} Account"
     message = (
         f"Hello {user.first_name or user.username},\n\n"
@@ -11,10 +18,108 @@ def send_welcome_email(user, password, role):
         f"Password: {password}\n\n"
         f"Please log in and change your password immediately."
     )
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=False,
-    )
\ No newline at end of file
+    return subject, message
+
+
+def queue_email(subject, message, recipients, from_email=None):
+    """
+    Enqueue a message per recipient; the `send_queued_mail` worker delivers it.
+    """
+    OutboundEmail.objects.bulk_create([
+        OutboundEmail(
+            to_email=recipient,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL or '',
+            subject=subject,
+            body=message,
+        )
+        for recipient in recipients
+    ])
+
+
+def send_welcome_email(user, password, role):
+    subject, message = _welcome_message(user, password, role)
+    queue_email(subject, message, [user.email])
+
+
+def send_welcome_emails(users_with_passwords, role):
+    """
+    Enqueue welcome emails for a bulk import in one INSERT.
+    """
+    emails = []
+    for user, password in users_with_passwords:
+        subject, message = _welcome_message(user, password, role)
+        emails.append(OutboundEmail(
+            to_email=user.email,
+            from_email=settings.DEFAULT_FROM_EMAIL or '',
+            subject=subject,
+            body=message,
+        ))
+    OutboundEmail.objects.bulk_create(emails, batch_size=500)
+
+
+def _claim_due_emails(batch_size):
+    """
+    Lease a batch of due messages so parallel workers never send the same one.
+    If a worker dies mid-batch, the lease expires and another worker retries.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboundEmail.objects.filter(id__in=ids).update(
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(seconds=settings.MAIL_QUEUE_LEASE_SECONDS),
+        )
+    return list(OutboundEmail.objects.filter(id__in=ids))
+
+
+def _retry_delay(attempts):
+    # 30s, 1m, 2m, 4m ... capped at one hour
+    return timedelta(seconds=min(30 * 2 ** (attempts - 1), 3600))
+
+
+def deliver_queued_emails(batch_size=None):
+    """
+    Send one batch of due messages over a single SMTP connection.
+    Failed messages are retried with exponential backoff up to MAIL_QUEUE_MAX_ATTEMPTS.
+    Returns (sent, failed) counts for the batch.
+    """
+    emails = _claim_due_emails(batch_size or settings.MAIL_QUEUE_BATCH_SIZE)
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email or None, [email.to_email], connection=connection
+            )
+            try:
+                # No-op while the connection is up; reconnects after a failure
+                connection.open()
+                message.send()
+            except Exception as e:
+                failed += 1
+                email.last_error = str(e)
+                if email.attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS:
+                    email.status = 'failed'
+                else:
+                    email.next_attempt_at = timezone.now() + _retry_delay(email.attempts)
+                email.save(update_fields=['status', 'last_error', 'next_attempt_at'])
+                # The connection may be broken; start a fresh one for the rest of the batch
+                connection.close()
+                continue
+
+            sent += 1
+            # Welcome mails carry a temporary password; don't keep it once delivered
+            email.status, email.sent_at, email.body, email.last_error = 'sent', timezone.now(), '', ''
+            email.save(update_fields=['status', 'sent_at', 'body', 'last_error'])
+    finally:
+        connection.close()
+
+    return sent, failed
@@ -151,6 +151,17 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Serve MEDIA_ROOT/vocab_audio (pronunciation clips) from Django with immutable cache headers.
+# django.views.static.serve ties up a worker per file; in production turn this off and let a
+# reverse proxy serve the directory with the same headers (see README, "Serving media").
+SERVE_VOCAB_AUDIO = os.getenv('SERVE_VOCAB_AUDIO', 'True') == 'True'
+
+# Student activity retention
+# Rows older than this are rolled up and moved to gzip archives by `manage.py archive_activity`
+ACTIVITY_RETENTION_DAYS = int(os.getenv('ACTIVITY_RETENTION_DAYS', 180))
+ACTIVITY_ARCHIVE_DIR = os.getenv('ACTIVITY_ARCHIVE_DIR', os.path.join(BASE_DIR, 'archive', 'activity'))
+ACTIVITY_ARCHIVE_CHUNK_SIZE = int(os.getenv('ACTIVITY_ARCHIVE_CHUNK_SIZE', 1000))
+
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -164,13 +175,28 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp.hostinger.com"
-EMAIL_USE_SSL = True
-EMAIL_PORT = 465
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.hostinger.com")
+EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL", "True") == "True"
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 465))
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Outbound mail queue (delivered by `manage.py send_queued_mail`)
+MAIL_QUEUE_BATCH_SIZE = int(os.getenv('MAIL_QUEUE_BATCH_SIZE', 50))
+MAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv('MAIL_QUEUE_MAX_ATTEMPTS', 5))
+MAIL_QUEUE_LEASE_SECONDS = int(os.getenv('MAIL_QUEUE_LEASE_SECONDS', 300))
+
+# Hourly vocabulary trend counters are buffered in-process and written every
+# VOCAB_TREND_FLUSH_SIZE lookups or VOCAB_TREND_FLUSH_SECONDS, whichever comes first
+VOCAB_TREND_FLUSH_SIZE = int(os.getenv('VOCAB_TREND_FLUSH_SIZE', 200))
+VOCAB_TREND_FLUSH_SECONDS = int(os.getenv('VOCAB_TREND_FLUSH_SECONDS', 30))
+# Buckets older than this are deleted by `manage.py archive_activity` (trending looks back 90 days at most)
+VOCAB_TREND_RETENTION_DAYS = int(os.getenv('VOCAB_TREND_RETENTION_DAYS', 90))
+
+# Processes used to hash passwords during bulk roster imports
+ROSTER_HASH_WORKERS = int(os.getenv('ROSTER_HASH_WORKERS', os.cpu_count() or 1))
+
 # AI Helper Service URL
 AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://ai-helper:8000")
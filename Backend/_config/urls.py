@@ -1,12 +1,28 @@
+import os
+
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.decorators.cache import cache_control
+from django.views.static import serve
+
+from app.students.pronunciation import AUDIO_CACHE_SECONDS
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/',include("_config.api.urls")),
 ]
 
+if settings.SERVE_VOCAB_AUDIO:
+    # Pronunciation clips are named by content hash, so they never change: cache them for good
+    urlpatterns += [
+        re_path(
+            r'^%svocab_audio/(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'),
+            cache_control(public=True, max_age=AUDIO_CACHE_SECONDS, immutable=True)(serve),
+            {'document_root': os.path.join(settings.MEDIA_ROOT, 'vocab_audio')},
+        ),
+    ]
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from _config.services import deliver_queued_emails
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued outbound emails in batches over a reused SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Messages per batch (defaults to MAIL_QUEUE_BATCH_SIZE)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep polling the queue instead of exiting when it is empty')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to sleep between polls when the queue is empty')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_queued_emails(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                # A full batch usually means more is waiting; go again straight away
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -3,7 +3,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.core.mail import send_mail
+from _config.services import queue_email
 from .serializers import LoginSerializer,ForgotPasswordSerializer,VerifyOTPSerializer,ResetPasswordSerializer
 from django.contrib.auth import get_user_model
 
@@ -45,13 +45,12 @@ class ForgotPasswordView(APIView):
             user = User.objects.get(email=email)
             user.generate_otp()
             
-            # Send Email
-            send_mail(
+            # Queue Email (delivered by the send_queued_mail worker)
+            queue_email(
                 'Password Reset OTP',
                 f'Your OTP is {user.otp}. It expires in 10 minutes.',
-                'support@flavorforge.io',
                 [email],
-                fail_silently=False,
+                from_email='support@flavorforge.io',
             )
             return Response({"message": "OTP sent to your email."}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,62 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Rows pulled from the database cursor per round trip
+EXPORT_CHUNK_SIZE = 2000
+
+STUDENT_EXPORT_FIELDS = [
+    'id', 'email', 'first_name', 'last_name', 'date_joined', 'is_active',
+    'student_profile__grade_level', 'student_profile__vocabulary_proficiency',
+    'student_profile__total_books_read', 'student_profile__words_learned',
+]
+
+ACTIVITY_EXPORT_FIELDS = [
+    'id', 'student_id', 'student__email', 'student__student_profile__grade_level',
+    'action_type', 'description', 'timestamp',
+]
+
+
+class Echo:
+    """File-like object whose write() hands the formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _column_names(fields):
+    # 'student_profile__grade_level' -> 'grade_level'
+    return [field.split('__')[-1] for field in fields]
+
+
+def csv_lines(queryset, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(_column_names(fields))
+    for row in queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow(row)
+
+
+def ndjson_lines(queryset, fields):
+    columns = _column_names(fields)
+    for row in queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+async def stream_lines(lines, batch_size=500):
+    """
+    Serve a synchronous line generator from the ASGI server without materialising it.
+    Django would otherwise list() a sync iterator before sending it; here batches are
+    pulled on the request's sync thread so the database cursor stays on one connection.
+    """
+    fetch = sync_to_async(lambda: "".join(islice(lines, batch_size)))
+    try:
+        while True:
+            chunk = await fetch()
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await sync_to_async(lines.close)()
@@ -0,0 +1,35 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ActivityCursorPagination(CursorPagination):
+    """
+    Cursor pagination over StudentActivity, newest first.
+    Uses the (timestamp) index so deep pages cost the same as the first one.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-timestamp', '-id')
+
+
+def keyset_paginate(queryset, params, default_limit=50, max_limit=200):
+    """
+    Keyset pagination on the primary key: ?after=<last id seen>&limit=<n>.
+    Unlike OFFSET, every page is a single index range scan.
+    Returns (page, next_after); next_after is None on the last page.
+    """
+    try:
+        limit = min(int(params.get('limit', default_limit)), max_limit)
+    except ValueError:
+        limit = default_limit
+    limit = max(limit, 1)
+
+    after = params.get('after')
+    queryset = queryset.order_by('id')
+    if after and after.isdigit():
+        queryset = queryset.filter(id__gt=int(after))
+
+    # Fetch one extra row to know whether another page exists
+    page = list(queryset[:limit + 1])
+    next_after = page[limit - 1].id if len(page) > limit else None
+    return page[:limit], next_after
@@ -0,0 +1,64 @@
+import uuid
+
+from django.core.cache import cache
+
+_UNKNOWN = object()
+
+
+class SingletonRegistry:
+    """
+    Process-local cache of the single-row configuration models (id=1).
+
+    Each model has a version stamp in Redis. A read costs one Redis GET instead
+    of a get_or_create against the database; saving a model replaces the stamp so
+    every worker reloads it on its next read. Stamps are random, never counters:
+    after a Redis flush a counter would restart and could come back to a value
+    some worker still has cached.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    @staticmethod
+    def _version_key(model):
+        return f"singleton-version:{model._meta.label_lower}"
+
+    def _current_version(self, model):
+        key = self._version_key(model)
+        try:
+            version = cache.get(key)
+            if version is None:
+                # Missing after a flush or restart: start a fresh stamp (add, so workers agree on one)
+                cache.add(key, uuid.uuid4().hex, timeout=None)
+                version = cache.get(key)
+            return version if version is not None else _UNKNOWN
+        except Exception as e:
+            print(f"Singleton version check failed: {e}")
+            return _UNKNOWN
+
+    def get(self, model):
+        """
+        Return the shared instance. Treat it as read-only; edit a fresh copy from the database.
+        """
+        label = model._meta.label_lower
+        # Read the version before the row: a save landing in between leaves us
+        # holding an older version number, which only triggers one extra reload.
+        version = self._current_version(model)
+        entry = self._entries.get(label)
+        if entry and version is not _UNKNOWN and entry[0] == version:
+            return entry[1]
+
+        instance, _ = model.objects.get_or_create(id=1)
+        if version is not _UNKNOWN:
+            self._entries[label] = (version, instance)
+        return instance
+
+    def bump(self, model):
+        self._entries.pop(model._meta.label_lower, None)
+        try:
+            cache.set(self._version_key(model), uuid.uuid4().hex, timeout=None)
+        except Exception as e:
+            print(f"Singleton version bump failed: {e}")
+
+
+settings_registry = SingletonRegistry()
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from app.dashboard.models import (AiAssistantConfigModel, PlatformConfigModel,
                                   PrivacyAndPolicyModel,
                                   TermsAndConditionsModel)
+from app.students.leaderboard import top_words
 from app.students.models import StudentActivity, VocabularySearch, StoryRecommendation
 from app.story.models import StoryModel
 from django.contrib.auth import get_user_model
@@ -11,18 +12,28 @@ User = get_user_model()
 
 
 class RecentActivitySerializer(serializers.ModelSerializer):
-    student_name = serializers.CharField(source='student.full_name', read_only=True)
+    student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     time_ago = serializers.SerializerMethodField()
 
     class Meta:
         model = StudentActivity
-        fields = ['student_name', 'action_type', 'description', 'time_ago']
+        fields = ['id', 'student', 'student_name', 'action_type', 'description', 'timestamp', 'time_ago']
 
     def get_time_ago(self, obj):
         # You can use timesince here or a custom format
         from django.utils.timesince import timesince
         return timesince(obj.timestamp)
 
+class DictionarySearchSerializer(serializers.ModelSerializer):
+    word = serializers.SerializerMethodField()
+
+    class Meta:
+        model = StudentActivity
+        fields = ['id', 'word', 'description', 'timestamp']
+
+    def get_word(self, obj):
+        return StudentActivity.word_from_description(obj.description)
+
 class AdminDashboardSerializer(serializers.Serializer):
     total_students = serializers.IntegerField()
     total_stories = serializers.IntegerField()
@@ -31,8 +42,8 @@ class AdminDashboardSerializer(serializers.Serializer):
     top_searched_words = serializers.SerializerMethodField()
 
     def get_top_searched_words(self, obj):
-        top_words = VocabularySearch.objects.order_by('-search_count')[:5]
-        return [{"word": w.word, "count": w.search_count} for w in top_words]
+        # Optional 'day' / 'week' window passed in by the view
+        return top_words(5, window=self.context.get('window'))
     
     
 class AiAssistantConfigSerializer(serializers.ModelSerializer):
@@ -91,6 +102,9 @@ class AdminStudentListSerializer(serializers.ModelSerializer):
         ]
 
     def get_dictionary_search_count(self, obj):
+        # List views annotate this via with_search_counts(); fall back to a query for single objects
+        if hasattr(obj, 'dictionary_search_count'):
+            return obj.dictionary_search_count
         return StudentActivity.objects.filter(student=obj, action_type='VOCAB_SEARCH').count()
 
 class StoryRecommendationSerializer(serializers.ModelSerializer):
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from app.dashboard.models import (AiAssistantConfigModel, PlatformConfigModel,
+                                  PrivacyAndPolicyModel,
+                                  TermsAndConditionsModel)
+from app.dashboard.registry import settings_registry
+
+SINGLETON_MODELS = [AiAssistantConfigModel, PlatformConfigModel, PrivacyAndPolicyModel, TermsAndConditionsModel]
+
+
+def bump_singleton_version(sender, **kwargs):
+    transaction.on_commit(lambda: settings_registry.bump(sender))
+
+
+for model in SINGLETON_MODELS:
+    post_save.connect(bump_singleton_version, sender=model)
+    post_delete.connect(bump_singleton_version, sender=model)
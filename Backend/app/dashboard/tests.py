@@ -1,3 +1,56 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from app.students.models import StudentProfile
+
+User = get_user_model()
+
+
+class StudentBulkUpdateTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_user(username="principal", email="principal@school.test",
+                                         password="pass12345", is_staff=True, is_admin_user=True)
+        for name, grade in [("arnold", 3), ("wanda", 4), ("keesha", 5)]:
+            user = User.objects.create_user(username=name, email=f"{name}@school.test",
+                                            password="pass12345", is_student=True)
+            StudentProfile.objects.create(user=user, grade_level=grade)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.url = reverse('student-bulk-update')
+
+    def grades(self):
+        return dict(StudentProfile.objects.values_list('user__username', 'grade_level'))
+
+    def test_dry_run_only_counts(self):
+        response = self.client.post(self.url, {"operation": "promote", "all": True, "dry_run": True}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"operation": "promote", "matched": 3, "dry_run": True,
+                                         "updated": 2, "unchanged": 1})
+        self.assertEqual(self.grades(), {"arnold": 3, "wanda": 4, "keesha": 5})
+
+    def test_commit_promotes_up_to_the_top_grade(self):
+        response = self.client.post(self.url, {"operation": "promote", "all": True, "dry_run": "false"}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['dry_run'], response.data['updated'], response.data['unchanged']),
+                         (False, 2, 1))
+        self.assertEqual(self.grades(), {"arnold": 4, "wanda": 5, "keesha": 5})
+
+    def test_chunked_commit_matches_single_transaction(self):
+        response = self.client.post(self.url, {"operation": "set_proficiency", "value": "advanced",
+                                               "grade": 3, "chunk_size": 1}, format='json')
+
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(StudentProfile.objects.get(user__username="arnold").vocabulary_proficiency, "advanced")
+        self.assertEqual(StudentProfile.objects.filter(vocabulary_proficiency="advanced").count(), 1)
+
+    def test_invalid_input_is_rejected(self):
+        for body in [{"operation": "promote"},
+                     {"operation": "promote", "all": True, "dry_run": "maybe"},
+                     {"operation": "promote", "all": True, "chunk_size": 0},
+                     {"operation": "set_proficiency", "value": "expert", "all": True}]:
+            self.assertEqual(self.client.post(self.url, body, format='json').status_code, 400, body)
+        self.assertEqual(self.grades(), {"arnold": 3, "wanda": 4, "keesha": 5})
@@ -1,7 +1,15 @@
+import hashlib
+import json
+
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from rest_framework import permissions, status
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -14,16 +22,52 @@ from app.students.models import (StudentActivity, StudentProfile,
                                  VocabularySearch)
 from app.students.serializers import StudentUserSerializer
 from app.teachers.models import TeacherProfile
+from app.teachers.views import IsTeacherUser
 from app.teachers.serializers import TeacherUserSerializer
 
 from .serializers import (AdminDashboardSerializer,
                           AiAssistantConfigSerializer, AiAssistantConfigInputSerializer,
                           PlatformConfigSerializer, PrivacySerializer,
-                          TermsSerializer, AdminStudentListSerializer, StoryRecommendationSerializer)
+                          TermsSerializer, AdminStudentListSerializer, StoryRecommendationSerializer,
+                          RecentActivitySerializer, DictionarySearchSerializer)
+from app.students.bulk import bulk_update_profiles, recommend_stories, select_students
+from app.students.filters import filter_students, with_search_counts
+from app.students.leaderboard import record_search
+from app.students.roster import import_roster, rows_from_request
+from app.students.trends import trend_buffer, trending_words
+from .exports import (ACTIVITY_EXPORT_FIELDS, STUDENT_EXPORT_FIELDS,
+                      csv_lines, ndjson_lines, stream_lines)
+from .pagination import ActivityCursorPagination, keyset_paginate
+from .registry import settings_registry
 
 #
 User = get_user_model()
 
+# Number of activities shown on the overview; the full log lives behind /site/activity/
+RECENT_ACTIVITY_LIMIT = 20
+
+# Student detail page: latest dictionary searches shown inline, and how many distinct words to rank
+RECENT_DICTIONARY_LIMIT = 20
+DICTIONARY_WORDS_LIMIT = 50
+
+# How long clients and proxies may reuse the public Terms/Privacy pages before revalidating
+PUBLIC_CONTENT_MAX_AGE = 300
+
+
+def cacheable_response(request, data):
+    """
+    Response with an ETag over the payload and a public Cache-Control header.
+    Answers 304 when the client already holds the same content.
+    """
+    etag = '"%s"' % hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    if etag in request.headers.get('If-None-Match', ''):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=PUBLIC_CONTENT_MAX_AGE)
+    return response
+
 class AdminDashboardView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
@@ -32,12 +76,51 @@ class AdminDashboardView(APIView):
             "total_students": User.objects.filter(is_student=True).count(),
             "total_stories": StoryModel.objects.count(),
             "total_vocabulary_searched": VocabularySearch.objects.count(),
-            "recent_students_activity": StudentActivity.objects.all()
+            "recent_students_activity": StudentActivity.objects.select_related('student')[:RECENT_ACTIVITY_LIMIT]
         }
         
-        serializer = AdminDashboardSerializer(data)
+        serializer = AdminDashboardSerializer(data, context={'window': request.query_params.get('window')})
         return Response(serializer.data)
 
+class ActivityFeedAPIView(generics.ListAPIView):
+    """
+    Full student activity log, newest first, paginated by cursor.
+    Optional ?action_type= filter.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = RecentActivitySerializer
+    pagination_class = ActivityCursorPagination
+
+    def get_queryset(self):
+        queryset = StudentActivity.objects.select_related('student')
+        action_type = self.request.query_params.get('action_type')
+        if action_type:
+            queryset = queryset.filter(action_type=action_type)
+        return queryset
+
+class TrendingVocabularyAPIView(APIView):
+    """
+    Words students are looking up most right now, from the hourly trend buckets.
+    ?hours= (window, default 168 = a week), ?half_life= (hours, default 24), ?limit= (default 10).
+    """
+    permission_classes = [permissions.IsAdminUser | IsTeacherUser]
+
+    def get(self, request):
+        try:
+            hours = min(max(int(request.query_params.get('hours', 168)), 1), 24 * 90)
+            half_life = max(float(request.query_params.get('half_life', 24)), 1)
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+        except ValueError:
+            return Response({"error": "hours, half_life and limit must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Include this process's not-yet-written lookups
+        trend_buffer.flush()
+        return Response({
+            "hours": hours,
+            "half_life_hours": half_life,
+            "words": trending_words(hours=hours, half_life_hours=half_life, limit=limit),
+        })
+
 class VocabularySearchView(APIView):
     """
     Search for a word, track the search count, and return info + audio.
@@ -51,8 +134,7 @@ class VocabularySearchView(APIView):
 
         # 1. Update or Create the search record
         vocab, created = VocabularySearch.objects.get_or_create(word=query)
-        vocab.search_count += 1
-        vocab.save()
+        search_count = record_search(vocab)
 
         # 2. Log this as a student activity
         StudentActivity.objects.create(
@@ -65,7 +147,7 @@ class VocabularySearchView(APIView):
             "word": vocab.word,
             "definition": vocab.definition or "Definition pending review",
             "audio_url": request.build_absolute_uri(vocab.audio_spelling.url) if vocab.audio_spelling else None,
-            "search_count": vocab.search_count
+            "search_count": search_count
         })
         
         
@@ -75,9 +157,16 @@ class StudentListCreateAPIView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        students = User.objects.filter(is_student=True).select_related('student_profile')
-        serializer = AdminStudentListSerializer(students, many=True)
-        return Response(serializer.data)
+        try:
+            students = filter_students(
+                User.objects.filter(is_student=True).select_related('student_profile'),
+                request.query_params
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        page, next_after = keyset_paginate(with_search_counts(students), request.query_params)
+        serializer = AdminStudentListSerializer(page, many=True)
+        return Response({"results": serializer.data, "next_after": next_after})
 
     @transaction.atomic
     def post(self, request):
@@ -93,12 +182,11 @@ class StudentListCreateAPIView(APIView):
         user = User.objects.create_user(
             username=email,
             email=email,
+            password=password,
             first_name=data.get('first_name', ''),
             last_name=data.get('last_name', ''),
             is_student=True
         )
-        user.set_password(password)
-        user.save()
 
         # 3. Use update_or_create instead of create
         # This safely handles signals and manual creation
@@ -119,6 +207,23 @@ class StudentListCreateAPIView(APIView):
 
         return Response({"message": "Student added and email sent"}, status=status.HTTP_201_CREATED)
 
+class StudentRosterImportAPIView(APIView):
+    """
+    Bulk-create students from a CSV/JSON roster.
+    Every row is validated first; nothing is written if any row fails unless ?skip_invalid=true.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        try:
+            rows = rows_from_request(request)
+        except ValueError as e:
+            return Response({"error": f"Could not read roster: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        skip_invalid = request.query_params.get('skip_invalid') == 'true'
+        result = import_roster(rows, skip_invalid=skip_invalid)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST)
+
 class StudentDetailAPIView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
@@ -135,16 +240,13 @@ class StudentDetailAPIView(APIView):
         # total story created count:
         data['total_story_created_count'] = student.my_creative_stories.count() # assuming related_name='my_creative_stories' in StoryModel
         
-        # all dictionary searched list:
-        vocab_searches = VocabularySearch.objects.filter(word__in=student.activities.filter(action_type='VOCAB_SEARCH').values_list('description', flat=True)) 
-        # Actually a better query would be:
-        # But wait, VocabularySearch tracks global searches. StudentActivity tracks per student.
-        # description="Searched for the word: '{query}'"
-        # We need to parse or just list the activities.
-        # Let's list the activities for now as that's what we have.
-        # Or better, fetch StudentActivity of type VOCAB_SEARCH
-        searches = student.activities.filter(action_type='VOCAB_SEARCH').values('description', 'timestamp')
-        data['all_dictionary_searched_list'] = searches
+        # dictionary searches: a recent window plus per-word totals from one GROUP BY;
+        # the full history is paged at admin/students/<id>/dictionary-history/
+        searches = student.activities.filter(action_type='VOCAB_SEARCH')
+        data['all_dictionary_searched_list'] = list(
+            searches.order_by('-timestamp').values('description', 'timestamp')[:RECENT_DICTIONARY_LIMIT]
+        )
+        data['dictionary_word_counts'] = dictionary_word_counts(searches)
 
         # recommended story list:
         recommendations = student.recommendations.select_related('story').all()
@@ -173,6 +275,35 @@ class StudentDetailAPIView(APIView):
         student.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+def dictionary_word_counts(searches, limit=None):
+    """
+    Per-word search counts for a VOCAB_SEARCH queryset, most searched first.
+    Grouped in SQL by description; the two description formats for one word are merged here.
+    """
+    words = {}
+    grouped = searches.order_by().values('description').annotate(count=Count('id'), last_searched=Max('timestamp'))
+    for row in grouped:
+        word = StudentActivity.word_from_description(row['description'])
+        entry = words.setdefault(word, {"word": word, "count": 0, "last_searched": row['last_searched']})
+        entry['count'] += row['count']
+        entry['last_searched'] = max(entry['last_searched'], row['last_searched'])
+    ranked = sorted(words.values(), key=lambda entry: (-entry['count'], entry['word']))
+    return ranked[:limit or DICTIONARY_WORDS_LIMIT]
+
+
+class StudentDictionaryHistoryAPIView(generics.ListAPIView):
+    """
+    A student's full dictionary search history, newest first, paginated by cursor.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = DictionarySearchSerializer
+    pagination_class = ActivityCursorPagination
+
+    def get_queryset(self):
+        student = get_object_or_404(User, pk=self.kwargs['pk'], is_student=True)
+        return StudentActivity.objects.filter(student=student, action_type='VOCAB_SEARCH')
+
+
 class StudentRecommendationAPIView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
@@ -206,6 +337,126 @@ class StudentRecommendationAPIView(APIView):
         pass
 
 
+class BulkRecommendationAPIView(APIView):
+    """
+    Recommend stories to many students at once.
+    Body: {"story_ids": [...], plus "student_ids": [...], "grade": n and/or "classroom_id": n}.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        try:
+            students = select_students(User.objects.filter(is_student=True), request.data)
+            result = recommend_stories(students, request.data.get('story_ids'), request.user)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
+
+
+class StudentBulkUpdateAPIView(APIView):
+    """
+    Set-based profile changes for many students, e.g. the year-end promotion.
+    Body: {"operation": "promote" | "assign_teacher" | "set_proficiency", "value": ...,
+           "student_ids"/"grade"/"classroom_id" or "all": true,
+           "dry_run": bool, "chunk_size": n (commit per chunk instead of one transaction)}.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request):
+        data = request.data
+        # "false"/"0" from form or query input must not count as true
+        try:
+            dry_run = serializers.BooleanField().to_internal_value(data.get('dry_run', False))
+        except serializers.ValidationError:
+            return Response({"error": "dry_run must be true or false"}, status=status.HTTP_400_BAD_REQUEST)
+        chunk_size = None
+        if data.get('chunk_size') not in (None, ''):
+            try:
+                chunk_size = int(data['chunk_size'])
+            except (TypeError, ValueError):
+                chunk_size = 0
+            if chunk_size < 1:
+                return Response({"error": "chunk_size must be a positive integer"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            students = select_students(User.objects.filter(is_student=True), data)
+            result = bulk_update_profiles(
+                students,
+                data.get('operation'),
+                value=data.get('value'),
+                dry_run=dry_run,
+                chunk_size=chunk_size,
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+
+
+# --- EXPORTS ---
+
+class BaseExportAPIView(APIView):
+    """
+    Streams a queryset as CSV (default) or NDJSON (?file_format=ndjson).
+    Rows are read with a chunked cursor, so memory stays flat for any export size.
+    Common filters: ?grade=, ?date_from=YYYY-MM-DD, ?date_to=YYYY-MM-DD.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    export_name = None
+    fields = None
+    date_field = None
+    grade_field = None
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get(self, request):
+        params = request.query_params
+        queryset = self.get_queryset()
+
+        if params.get('grade'):
+            if not params['grade'].isdigit():
+                return Response({"error": "grade must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(**{self.grade_field: int(params['grade'])})
+        for param, lookup in (('date_from', 'gte'), ('date_to', 'lte')):
+            if not params.get(param):
+                continue
+            try:
+                day = parse_date(params[param])
+            except ValueError:
+                day = None
+            if day is None:
+                return Response({"error": f"{param} must be a date (YYYY-MM-DD)"}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(**{f"{self.date_field}__date__{lookup}": day})
+
+        # 'format' is taken by DRF's renderer negotiation
+        if params.get('file_format') == 'ndjson':
+            lines, content_type, extension = ndjson_lines(queryset, self.fields), 'application/x-ndjson', 'ndjson'
+        else:
+            lines, content_type, extension = csv_lines(queryset, self.fields), 'text/csv', 'csv'
+
+        response = StreamingHttpResponse(stream_lines(lines), content_type=content_type)
+        filename = f"{self.export_name}-{timezone.now():%Y%m%d}.{extension}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+class StudentExportAPIView(BaseExportAPIView):
+    export_name = 'students'
+    fields = STUDENT_EXPORT_FIELDS
+    date_field = 'date_joined'
+    grade_field = 'student_profile__grade_level'
+
+    def get_queryset(self):
+        return User.objects.filter(is_student=True).order_by('id')
+
+class ActivityExportAPIView(BaseExportAPIView):
+    export_name = 'activity'
+    fields = ACTIVITY_EXPORT_FIELDS
+    date_field = 'timestamp'
+    grade_field = 'student__student_profile__grade_level'
+
+    def get_queryset(self):
+        return StudentActivity.objects.order_by('id')
+
+
 # --- TEACHER MANAGEMENT ---
 
 class TeacherListCreateAPIView(APIView):
@@ -226,12 +477,11 @@ class TeacherListCreateAPIView(APIView):
         user = User.objects.create_user(
             username=email,
             email=email,
+            password=password,
             first_name=data.get('first_name', ''),
             last_name=data.get('last_name', ''),
             is_teacher=True
         )
-        user.set_password(password)
-        user.save()
 
         # 2. Use update_or_create to prevent IntegrityErrors
         TeacherProfile.objects.update_or_create(
@@ -275,7 +525,7 @@ class AiAssistantConfigAPIView(APIView):
 
     def get(self, request):
         # Always get the first record, or create a default one if it doesn't exist
-        config, _ = AiAssistantConfigModel.objects.get_or_create(id=1)
+        config = settings_registry.get(AiAssistantConfigModel)
         serializer = AiAssistantConfigSerializer(config)
         return Response(serializer.data)
 
@@ -294,7 +544,7 @@ class PlatformConfigAPIView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        config, _ = PlatformConfigModel.objects.get_or_create(id=1)
+        config = settings_registry.get(PlatformConfigModel)
         serializer = PlatformConfigSerializer(config)
         return Response(serializer.data)
 
@@ -312,9 +562,9 @@ class TermsAPIView(APIView):
         return [permissions.IsAdminUser()]
 
     def get(self, request):
-        obj, _ = TermsAndConditionsModel.objects.get_or_create(id=1)
+        obj = settings_registry.get(TermsAndConditionsModel)
         serializer = TermsSerializer(obj)
-        return Response(serializer.data)
+        return cacheable_response(request, serializer.data)
 
     def post(self, request):
         obj, _ = TermsAndConditionsModel.objects.get_or_create(id=1)
@@ -330,9 +580,9 @@ class PrivacyAPIView(APIView):
         return [permissions.IsAdminUser()]
 
     def get(self, request):
-        obj, _ = PrivacyAndPolicyModel.objects.get_or_create(id=1)
+        obj = settings_registry.get(PrivacyAndPolicyModel)
         serializer = PrivacySerializer(obj)
-        return Response(serializer.data)
+        return cacheable_response(request, serializer.data)
 
     def post(self, request):
         obj, _ = PrivacyAndPolicyModel.objects.get_or_create(id=1)
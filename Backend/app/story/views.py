@@ -1,6 +1,10 @@
 # app/story/views.py
+import json
+
+import httpx
 import requests
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import generics, permissions,status
 from .models import StoryModel, ReadingTrack
 from .serializers import StoryLibrarySerializer, ContinueReadingSerializer, StoryCreateUpdateSerializer
@@ -201,6 +205,22 @@ class StoryEditorAPIView(APIView):
         story.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
     
+async def relay_ai_stream(url, payload):
+    """
+    Pass the AI service's SSE bytes straight through to the client.
+    Async, so under ASGI each chunk goes out as soon as it arrives.
+    """
+    try:
+        async with httpx.AsyncClient(timeout=httpx.Timeout(30, read=60)) as client:
+            async with client.stream("POST", url, json=payload) as upstream:
+                upstream.raise_for_status()
+                async for chunk in upstream.aiter_raw():
+                    yield chunk
+    except Exception as e:
+        print(f"Error relaying AI stream: {e}")
+        error = {"text": "I'm having trouble connecting to my owl-brain!", "detail": str(e)}
+        yield f"event: error\ndata: {json.dumps(error)}\n\n".encode()
+
 class OwlbertChatAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -213,7 +233,6 @@ class OwlbertChatAPIView(APIView):
         ai_base = getattr(settings, 'AI_SERVICE_URL', "http://localhost:8000")
         AI_URL = f"{ai_base}/chat" 
 
-        import json
         # Safely get student profile - teachers/admins won't have one
         student_profile = getattr(request.user, 'student_profile', None)
         grade_level = student_profile.grade_level if student_profile else None
@@ -228,6 +247,19 @@ class OwlbertChatAPIView(APIView):
             })
         }
 
+        # ?stream=true relays the AI service's token stream (Server-Sent Events) as it is generated;
+        # ?speech=true does the same with a spoken (base64 WAV) `audio` event per sentence
+        speech = request.query_params.get('speech') == 'true' or request.data.get('speech') is True
+        if speech or request.query_params.get('stream') == 'true' or request.data.get('stream') is True:
+            stream_url = f"{AI_URL}/speech/stream" if speech else f"{AI_URL}/stream"
+            response = StreamingHttpResponse(
+                relay_ai_stream(stream_url, payload),
+                content_type='text/event-stream',
+            )
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'
+            return response
+
         try:
             # Forwarding to FastAPI Orchestrator
             print(f"Connecting to AI Service at: {AI_URL}") # Debug log
@@ -250,6 +282,8 @@ class RealTimeCheckAPIView(APIView):
     """
     Fast endpoint for real-time spelling and grammar checking.
     Used during the 'Writing' process.
+    Suggestions are {offset, length, replacement, category} spans over `original`,
+    the text with HTML tags stripped.
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -276,14 +310,16 @@ class RealTimeCheckAPIView(APIView):
             )
             
             if response.status_code == 200:
-                corrected = response.json().get('corrected_text', '')
-                
-                # 4. Compare Original vs Corrected
-                # If they are different, it means there was an error
-                has_errors = clean_text.strip() != corrected.strip()
+                result = response.json()
+                corrected = result.get('corrected_text', '')
+
+                # 4. Span edits (offset/length into the plain text) the editor can underline directly
+                suggestions = result.get('edits', [])
+                has_errors = bool(suggestions) or clean_text.strip() != corrected.strip()
 
                 return Response({
                     "original": clean_text,
+                    "suggestions": suggestions,
                     "corrected": corrected,
                     "has_errors": has_errors,
                     "message": "Owlbert found some improvements!" if has_errors else "Looking good!"
@@ -303,13 +339,14 @@ class DictionaryHelperAPIView(APIView):
         
         if not word: return Response({"error": "Word required"}, status=400)
         
+        from app.students.leaderboard import record_search
         from app.students.models import VocabularySearch, StudentSavedWord, StudentActivity
+        from app.students.pronunciation import (pronunciation_due, record_pronunciation_failure,
+                                                store_pronunciation)
 
-        # 1. Always track global search
+        # 1. Always track global search (counted in the Redis leaderboard)
         vocab, _ = VocabularySearch.objects.get_or_create(word=word.lower())
-        vocab.search_count += 1
-        vocab.last_searched = timezone.now()
-        vocab.save()
+        record_search(vocab)
 
         # 2. Log Activity
         StudentActivity.objects.create(
@@ -327,21 +364,29 @@ class DictionaryHelperAPIView(APIView):
             return Response({"message": "Word saved to your vocabulary list"})
 
         # Lookup logic
-        # Check if we have definition, if not call AI
+        # Call AI once per word for a missing definition; missing audio is retried with a backoff
         definition = vocab.definition
-        if not definition:
+        need_audio = pronunciation_due(vocab)
+        if not definition or need_audio:
+             data = None
              # Call AI Learn Endpoint
              try:
                  ai_base = getattr(settings, 'AI_SERVICE_URL', "http://localhost:8000")
                  resp = requests.post(f"{ai_base}/learn", json={"word": word}, timeout=5)
                  if resp.status_code == 200:
                      data = resp.json()
-                     definition = data.get('description', 'No definition found.')
-                     # Update our DB
-                     vocab.definition = definition
-                     vocab.save()
              except:
-                 definition = "Definition unavailable at the moment."
+                 pass
+
+             if data is not None and not definition:
+                 definition = data.get('description', 'No definition found.')
+                 # Update our DB
+                 vocab.definition = definition
+                 vocab.save(update_fields=['definition'])
+             stored = data is not None and store_pronunciation(vocab, data.get('pronunciation_audio'))
+             if need_audio and not stored:
+                 record_pronunciation_failure(vocab)
+             definition = definition or "Definition unavailable at the moment."
 
         return Response({
             "word": word,
@@ -365,8 +410,10 @@ class ReadingTipsAPIView(APIView):
                  "conversation_history": []
              }
              resp = requests.post(f"{ai_base}/chat", json=payload, timeout=5)
-             if resp.status_code == 200:
-                 return Response({"tip": resp.json().get('safe_response')})
+             # /chat answers with ChatResponse, whose text is under 'chat_response'
+             tip = resp.json().get('chat_response') if resp.status_code == 200 else None
+             if tip:
+                 return Response({"tip": tip})
         except:
              pass
         
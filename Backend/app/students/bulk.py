@@ -0,0 +1,151 @@
+"""
+Set-based operations over many students at once.
+"""
+from itertools import product
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+
+from app.story.models import StoryModel
+from app.students.models import StoryRecommendation, StudentProfile
+from app.teachers.cohort import refresh_cohort_stats_on_commit
+from app.teachers.models import ClassroomMembership
+
+User = get_user_model()
+
+# Highest grade the platform serves; students already there are left as they are
+TOP_GRADE = max(grade for grade, _ in StudentProfile.GRADE_CHOICES)
+PROFICIENCY_VALUES = {value for value, _ in StudentProfile.PROFICIENCY_CHOICES}
+PROFILE_OPERATIONS = ('promote', 'assign_teacher', 'set_proficiency')
+
+
+def _id_list(value):
+    if not isinstance(value, list):
+        raise ValueError("expected a list of ids")
+    try:
+        return [int(item) for item in value]
+    except (TypeError, ValueError):
+        raise ValueError("ids must be integers")
+
+
+def select_students(students, data):
+    """
+    Narrow an already permission-scoped student queryset by the request body:
+    "student_ids": [...], "grade": n and/or "classroom_id": n. At least one is required,
+    or "all": true to take every student in scope.
+    """
+    if data.get('all') is True:
+        return students
+    if not any(data.get(key) not in (None, '', []) for key in ('student_ids', 'grade', 'classroom_id')):
+        raise ValueError("Provide student_ids, grade or classroom_id")
+
+    if data.get('student_ids') not in (None, '', []):
+        students = students.filter(id__in=_id_list(data['student_ids']))
+    if data.get('grade') not in (None, ''):
+        students = students.filter(student_profile__grade_level=data['grade'])
+    if data.get('classroom_id') not in (None, ''):
+        students = students.filter(classroom_memberships__classroom_id=data['classroom_id'])
+    return students
+
+
+def recommend_stories(students, story_ids, recommended_by, batch_size=1000):
+    """
+    Recommend every story to every student in one bulk insert.
+    Pairs that already exist are left alone by the (student, story) unique constraint.
+    """
+    student_ids = list(students.values_list('id', flat=True).distinct())
+    story_ids = list(StoryModel.objects.filter(id__in=_id_list(story_ids)).values_list('id', flat=True))
+    requested = len(student_ids) * len(story_ids)
+    if not requested:
+        return {"students": len(student_ids), "stories": len(story_ids), "created": 0, "already_recommended": 0}
+
+    existing = StoryRecommendation.objects.filter(student_id__in=student_ids, story_id__in=story_ids)
+    with transaction.atomic():
+        before = existing.count()
+        StoryRecommendation.objects.bulk_create(
+            [
+                StoryRecommendation(student_id=student_id, story_id=story_id, recommended_by=recommended_by)
+                for student_id, story_id in product(student_ids, story_ids)
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts leaves no way to tell which rows went in, so count instead
+        created = existing.count() - before
+
+    return {
+        "students": len(student_ids),
+        "stories": len(story_ids),
+        "created": created,
+        "already_recommended": requested - created,
+    }
+
+
+def _profile_changes(profiles, operation, value):
+    """
+    Returns (profiles that would change, the update() kwargs) for a bulk operation.
+    """
+    if operation == 'promote':
+        return profiles.filter(grade_level__lt=TOP_GRADE), {"grade_level": F('grade_level') + 1}
+
+    if operation == 'assign_teacher':
+        if value in (None, ''):
+            return profiles.filter(assigned_teacher__isnull=False), {"assigned_teacher": None}
+        teacher = User.objects.filter(pk=value, is_teacher=True).first()
+        if teacher is None:
+            raise ValueError("Teacher not found")
+        return profiles.exclude(assigned_teacher=teacher), {"assigned_teacher": teacher}
+
+    if operation == 'set_proficiency':
+        if value not in PROFICIENCY_VALUES:
+            raise ValueError(f"value must be one of {sorted(PROFICIENCY_VALUES)}")
+        return profiles.exclude(vocabulary_proficiency=value), {"vocabulary_proficiency": value}
+
+    raise ValueError(f"operation must be one of {list(PROFILE_OPERATIONS)}")
+
+
+def bulk_update_profiles(students, operation, value=None, dry_run=False, chunk_size=None):
+    """
+    Apply one operation to the profiles of `students` with UPDATE statements:
+    "promote" (one grade up, capped at the top grade), "assign_teacher" (value: teacher id,
+    empty to unassign) or "set_proficiency" (value: proficiency).
+
+    Everything runs in one transaction unless chunk_size is given, in which case each
+    chunk of profile ids commits on its own. dry_run only counts.
+    """
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    profiles = StudentProfile.objects.filter(user_id__in=students.values('id'))
+    changing, changes = _profile_changes(profiles, operation, value)
+
+    matched = profiles.count()
+    result = {"operation": operation, "matched": matched, "dry_run": dry_run}
+    if dry_run:
+        result.update(updated=changing.count(), unchanged=matched - changing.count())
+        return result
+
+    ids = list(changing.order_by('pk').values_list('pk', flat=True))
+    teachers = set()
+    if operation == 'assign_teacher':
+        # update() skips the signals that keep the cohort totals in step
+        teachers = set(changing.values_list('assigned_teacher_id', flat=True).distinct())
+        teachers.add(changes['assigned_teacher'].pk if changes['assigned_teacher'] else None)
+
+    step = chunk_size or len(ids) or 1
+    updated = 0
+    for start in range(0, len(ids), step):
+        chunk = StudentProfile.objects.filter(pk__in=ids[start:start + step])
+        with transaction.atomic():
+            if operation == 'assign_teacher':
+                # Classes belong to one teacher, so moving a student takes them out of the old ones
+                ClassroomMembership.objects.filter(student_id__in=chunk.values('user_id')).exclude(
+                    classroom__teacher=changes['assigned_teacher']
+                ).delete()
+            updated += chunk.update(**changes)
+
+    if teachers:
+        refresh_cohort_stats_on_commit(teachers)
+
+    result.update(updated=updated, unchanged=matched - updated)
+    return result
@@ -0,0 +1,44 @@
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from app.students.models import StudentActivity, StudentActivityRollup
+
+
+def filter_students(queryset, params):
+    """
+    Apply the student list filters: ?grade=, ?proficiency= and ?q= (name/email search).
+    Raises ValueError for a grade that isn't a number.
+    """
+    grade = params.get('grade')
+    if grade:
+        if not grade.isdigit():
+            raise ValueError("grade must be a number")
+        queryset = queryset.filter(student_profile__grade_level=int(grade))
+
+    proficiency = params.get('proficiency')
+    if proficiency:
+        queryset = queryset.filter(student_profile__vocabulary_proficiency=proficiency)
+
+    q = params.get('q', '').strip()
+    if q:
+        # Backed by the trigram indexes from accounts migration 0003 on PostgreSQL
+        queryset = queryset.filter(
+            Q(first_name__icontains=q) | Q(last_name__icontains=q) | Q(email__icontains=q)
+        )
+    return queryset
+
+
+def with_search_counts(queryset):
+    """
+    Annotate dictionary_search_count, including searches already rolled up by archive_activity.
+    Correlated subqueries are only evaluated for the rows of the current page.
+    """
+    live = StudentActivity.objects.filter(
+        student=OuterRef('pk'), action_type='VOCAB_SEARCH'
+    ).order_by().values('student').annotate(total=Count('id')).values('total')
+    archived = StudentActivityRollup.objects.filter(
+        student=OuterRef('pk'), action_type='VOCAB_SEARCH'
+    ).order_by().values('student').annotate(total=Sum('count')).values('total')
+    return queryset.annotate(
+        dictionary_search_count=Coalesce(Subquery(live), 0) + Coalesce(Subquery(archived), 0)
+    )
@@ -0,0 +1,146 @@
+"""
+Top searched words, kept in Redis sorted sets.
+
+Every lookup does a ZINCRBY on the all-time set plus the current day and
+week sets (which expire on their own). Top-N is a ZREVRANGE, O(log n + N),
+instead of sorting the VocabularySearch table. `manage.py
+reconcile_vocab_leaderboard` copies the Redis scores back into
+VocabularySearch.search_count.
+
+Each lookup raises the word's score to at least its DB count (which includes
+lookups counted while Redis was down). The full all-time set is seeded from
+the DB by `manage.py reconcile_vocab_leaderboard` (every run, when SEEDED_KEY
+is missing, i.e. after a deploy or flush); until then the all-time board is
+read from the DB column.
+"""
+from django.db.models import F
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+from app.students.models import VocabularySearch
+from app.students.trends import trend_buffer
+
+ALL_TIME_KEY = "vocab:top"
+SEEDED_KEY = "vocab:top:seeded"
+WINDOWS = {
+    # window -> (key format, TTL in seconds)
+    'day': ("vocab:top:day:%Y%m%d", 2 * 24 * 3600),
+    'week': ("vocab:top:week:%G-W%V", 14 * 24 * 3600),
+}
+
+
+def _window_key(window, now=None):
+    key_format, _ = WINDOWS[window]
+    return (now or timezone.now()).strftime(key_format)
+
+
+def record_search(vocab):
+    """
+    Count one lookup of a VocabularySearch row and return its new all-time count.
+    Falls back to incrementing the DB column when Redis is unavailable.
+    """
+    now = timezone.now()
+    trend_buffer.add(vocab.word, now)
+    try:
+        redis = get_redis_connection("default")
+        pipe = redis.pipeline()
+        if vocab.search_count:
+            pipe.zadd(ALL_TIME_KEY, {vocab.word: vocab.search_count}, gt=True)
+        pipe.zincrby(ALL_TIME_KEY, 1, vocab.word)
+        for window, (_, ttl) in WINDOWS.items():
+            key = _window_key(window, now)
+            pipe.zincrby(key, 1, vocab.word)
+            pipe.expire(key, ttl)
+        results = pipe.execute()
+        count = int(results[1 if vocab.search_count else 0])
+        VocabularySearch.objects.filter(pk=vocab.pk).update(last_searched=now)
+    except Exception as e:
+        print(f"Leaderboard update failed, counting in the database: {e}")
+        VocabularySearch.objects.filter(pk=vocab.pk).update(search_count=F('search_count') + 1, last_searched=now)
+        vocab.refresh_from_db(fields=['search_count'])
+        count = vocab.search_count
+    return count
+
+
+def top_words(limit=5, window=None):
+    """
+    [{"word": ..., "count": ...}] for the all-time board, or the current 'day' / 'week' window.
+    """
+    key = _window_key(window) if window in WINDOWS else ALL_TIME_KEY
+    try:
+        redis = get_redis_connection("default")
+        # Until the all-time set has been seeded it only holds recent lookups
+        if key != ALL_TIME_KEY or redis.exists(SEEDED_KEY):
+            ranked = redis.zrevrange(key, 0, limit - 1, withscores=True)
+            return [{"word": word.decode(), "count": int(score)} for word, score in ranked]
+    except Exception as e:
+        print(f"Leaderboard read failed: {e}")
+        if key != ALL_TIME_KEY:
+            return []
+    # Redis is down or the board isn't seeded yet: the indexed DB column is the fallback
+    top = VocabularySearch.objects.order_by('-search_count')[:limit]
+    return [{"word": w.word, "count": w.search_count} for w in top]
+
+
+def reconcile(batch_size=500):
+    """
+    Copy the all-time Redis scores into VocabularySearch.search_count.
+    Counts only ever grow, so a lower Redis score (e.g. after a flush) never lowers the column.
+    Returns the number of rows updated.
+    """
+    redis = get_redis_connection("default")
+    updated = 0
+    batch = {}
+
+    def flush():
+        rows = list(VocabularySearch.objects.filter(word__in=batch.keys()))
+        changed = []
+        for row in rows:
+            score = batch[row.word]
+            if score > row.search_count:
+                row.search_count = score
+                changed.append(row)
+        VocabularySearch.objects.bulk_update(changed, ['search_count'])
+        return len(changed)
+
+    for word, score in redis.zscan_iter(ALL_TIME_KEY, count=batch_size):
+        batch[word.decode()] = int(score)
+        if len(batch) >= batch_size:
+            updated += flush()
+            batch = {}
+    if batch:
+        updated += flush()
+    return updated
+
+
+def ensure_seeded():
+    """
+    Seed the all-time set unless that already happened since Redis last lost its data.
+    Returns the number of words seeded (0 if it was already seeded).
+    """
+    redis = get_redis_connection("default")
+    if redis.exists(SEEDED_KEY):
+        return 0
+    seeded = rebuild()
+    redis.set(SEEDED_KEY, 1)
+    return seeded
+
+
+def rebuild():
+    """
+    Seed the all-time set from the DB column, e.g. after Redis lost its data.
+    ZADD GT keeps any higher score already in Redis.
+    """
+    redis = get_redis_connection("default")
+    seeded = 0
+    batch = {}
+    for word, count in VocabularySearch.objects.filter(search_count__gt=0).values_list('word', 'search_count').iterator(chunk_size=2000):
+        batch[word] = count
+        if len(batch) >= 1000:
+            redis.zadd(ALL_TIME_KEY, batch, gt=True)
+            seeded += len(batch)
+            batch = {}
+    if batch:
+        redis.zadd(ALL_TIME_KEY, batch, gt=True)
+        seeded += len(batch)
+    return seeded
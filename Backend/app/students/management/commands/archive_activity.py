@@ -0,0 +1,106 @@
+import gzip
+import json
+import os
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from app.students.models import StudentActivity, StudentActivityRollup, VocabularyTrendBucket
+
+
+class Command(BaseCommand):
+    help = ('Rolls up StudentActivity rows past the retention window into monthly counts and moves them to gzip archives, '
+            'and deletes expired vocabulary trend buckets')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ACTIVITY_RETENTION_DAYS,
+                            help='Keep activities newer than this many days in the hot table')
+        parser.add_argument('--chunk-size', type=int, default=settings.ACTIVITY_ARCHIVE_CHUNK_SIZE,
+                            help='Rows archived and deleted per transaction')
+        parser.add_argument('--trend-days', type=int, default=settings.VOCAB_TREND_RETENTION_DAYS,
+                            help='Keep vocabulary trend buckets newer than this many days')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many rows would be archived or deleted')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        chunk_size = options['chunk_size']
+        expired = StudentActivity.objects.filter(timestamp__lt=cutoff)
+        trend_cutoff = timezone.now() - timedelta(days=options['trend_days'])
+        expired_trends = VocabularyTrendBucket.objects.filter(hour__lt=trend_cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f"{expired.count()} activities older than {cutoff:%Y-%m-%d} would be archived")
+            self.stdout.write(f"{expired_trends.count()} trend buckets older than {trend_cutoff:%Y-%m-%d} would be deleted")
+            return
+
+        self._prune_trends(expired_trends, chunk_size)
+
+        os.makedirs(settings.ACTIVITY_ARCHIVE_DIR, exist_ok=True)
+        self.stdout.write(f"Archiving activities older than {cutoff:%Y-%m-%d}...")
+
+        total = 0
+        while True:
+            # Walk the expired rows by primary key in small chunks so each
+            # transaction (and its row locks) stays short.
+            rows = list(
+                expired.order_by('id').values('id', 'student_id', 'action_type', 'description', 'timestamp')[:chunk_size]
+            )
+            if not rows:
+                break
+
+            # Write the archive first: if the delete below fails the rows are
+            # archived again on the next run, but never lost.
+            self._write_archive(rows)
+            with transaction.atomic():
+                self._rollup(rows)
+                StudentActivity.objects.filter(id__in=[row['id'] for row in rows]).delete()
+
+            total += len(rows)
+            self.stdout.write(f"  {total} archived")
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} activities to {settings.ACTIVITY_ARCHIVE_DIR}"))
+
+    def _prune_trends(self, expired_trends, chunk_size):
+        # Hourly counts have no archive value once they are past the trending window
+        total = 0
+        while True:
+            ids = list(expired_trends.order_by('id').values_list('id', flat=True)[:chunk_size])
+            if not ids:
+                break
+            total += VocabularyTrendBucket.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(f"Deleted {total} expired vocabulary trend buckets")
+
+    @staticmethod
+    def _month_of(timestamp):
+        return timezone.localtime(timestamp).date().replace(day=1)
+
+    def _write_archive(self, rows):
+        by_month = defaultdict(list)
+        for row in rows:
+            by_month[self._month_of(row['timestamp'])].append(row)
+
+        for month, month_rows in by_month.items():
+            path = os.path.join(settings.ACTIVITY_ARCHIVE_DIR, f"activity-{month:%Y-%m}.ndjson.gz")
+            # Appending adds a new gzip member; gzip readers treat the file as one stream
+            with gzip.open(path, 'at', encoding='utf-8') as archive:
+                for row in month_rows:
+                    archive.write(json.dumps({**row, 'timestamp': row['timestamp'].isoformat()}) + "\n")
+
+    def _rollup(self, rows):
+        counts = Counter(
+            (row['student_id'], row['action_type'], self._month_of(row['timestamp'])) for row in rows
+        )
+        for (student_id, action_type, month), count in counts.items():
+            updated = StudentActivityRollup.objects.filter(
+                student_id=student_id, action_type=action_type, month=month
+            ).update(count=F('count') + count)
+            if not updated:
+                StudentActivityRollup.objects.create(
+                    student_id=student_id, action_type=action_type, month=month, count=count
+                )
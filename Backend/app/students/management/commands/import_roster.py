@@ -0,0 +1,38 @@
+import csv
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from app.students.roster import import_roster, read_roster
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Bulk-imports students from a CSV or JSON roster file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (with header row) or JSON roster file')
+        parser.add_argument('--teacher', help='Email of the teacher to assign the students to')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Import the valid rows even if some rows fail validation')
+
+    def handle(self, *args, **options):
+        teacher = None
+        if options['teacher']:
+            teacher = User.objects.filter(email=options['teacher'], is_teacher=True).first()
+            if not teacher:
+                raise CommandError(f"No teacher with email {options['teacher']}")
+
+        try:
+            with open(options['path'], 'rb') as roster:
+                rows = read_roster(roster.read(), options['path'])
+        except (OSError, ValueError, csv.Error) as e:
+            raise CommandError(f"Could not read roster: {e}")
+
+        self.stdout.write(f"Importing {len(rows)} students...")
+        result = import_roster(rows, assigned_teacher=teacher, skip_invalid=options['skip_invalid'])
+
+        for error in result['errors']:
+            self.stdout.write(self.style.WARNING(f"Row {error['row']} ({error['email']}): {' '.join(error['errors'])}"))
+        self.stdout.write(self.style.SUCCESS(f"Created {result['created']} students"))
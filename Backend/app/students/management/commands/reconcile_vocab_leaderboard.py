@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.students.leaderboard import ensure_seeded, rebuild, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Copies the Redis top-searched-words scores back into VocabularySearch.search_count'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Re-seed the Redis board from the database even if it was already seeded')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep reconciling every --interval seconds')
+        parser.add_argument('--interval', type=float, default=300,
+                            help='Seconds between runs with --loop')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            self.stdout.write(f"Seeded {rebuild()} words into the leaderboard")
+
+        while True:
+            # After a deploy or Redis flush the board is seeded here, not in a request
+            try:
+                seeded = ensure_seeded()
+                if seeded:
+                    self.stdout.write(f"Seeded {seeded} words into the leaderboard")
+            except Exception as e:
+                self.stderr.write(f"Seeding failed: {e}")
+            self.stdout.write(self.style.SUCCESS(f"Reconciled {reconcile()} words"))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
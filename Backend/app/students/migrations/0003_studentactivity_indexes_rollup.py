@@ -0,0 +1,45 @@
+# Generated by Django 5.0 on 2026-10-19 16:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0002_storyrecommendation_studentsavedword'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentActivityRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action_type', models.CharField(choices=[('STORY_CREATE', 'Created a Story'), ('STORY_UPDATE', 'Updated a Story'), ('READ_START', 'Started Reading'), ('READ_COMPLETE', 'Finished Reading'), ('VOCAB_SEARCH', 'Searched Vocabulary')], max_length=20)),
+                ('month', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='studentactivity',
+            index=models.Index(fields=['-timestamp'], name='activity_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentactivity',
+            index=models.Index(fields=['student', '-timestamp'], name='activity_student_ts_idx'),
+        ),
+        migrations.AddField(
+            model_name='studentactivityrollup',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_rollups', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='studentactivityrollup',
+            unique_together={('student', 'action_type', 'month')},
+        ),
+    ]
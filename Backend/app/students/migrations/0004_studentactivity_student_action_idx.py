@@ -0,0 +1,19 @@
+# Generated by Django 5.0 on 2026-10-19 16:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_studentactivity_indexes_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentactivity',
+            index=models.Index(fields=['student', 'action_type'], name='activity_student_action_idx'),
+        ),
+    ]
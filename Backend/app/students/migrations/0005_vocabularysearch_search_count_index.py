@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_studentactivity_student_action_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vocabularysearch',
+            name='search_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+    ]
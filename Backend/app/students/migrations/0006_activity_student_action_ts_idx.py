@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-19 16:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0005_vocabularysearch_search_count_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='studentactivity',
+            name='activity_student_action_idx',
+        ),
+        migrations.AddIndex(
+            model_name='studentactivity',
+            index=models.Index(fields=['student', 'action_type', '-timestamp'], name='activity_student_action_ts_idx'),
+        ),
+    ]
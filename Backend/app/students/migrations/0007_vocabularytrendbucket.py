@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-19 16:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0006_activity_student_action_ts_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VocabularyTrendBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=100)),
+                ('hour', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='vocab_trend_hour_idx')],
+                'unique_together': {('word', 'hour')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-19 16:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0007_vocabularytrendbucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vocabularysearch',
+            name='audio_failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
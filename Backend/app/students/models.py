@@ -105,20 +105,76 @@ class StudentActivity(models.Model):
     class Meta:
         ordering = ['-timestamp']
         verbose_name_plural = "Student Activities"
+        indexes = [
+            models.Index(fields=['-timestamp'], name='activity_timestamp_idx'),
+            models.Index(fields=['student', '-timestamp'], name='activity_student_ts_idx'),
+            # Also serves a student's per-type history newest first (dictionary history)
+            models.Index(fields=['student', 'action_type', '-timestamp'], name='activity_student_action_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.action_type}"
+
+    @staticmethod
+    def word_from_description(description):
+        # VOCAB_SEARCH descriptions look like "Searched: cat" or "Searched for the word: 'cat'"
+        return description.split(':', 1)[-1].strip().strip("'").lower()
+
+
+class StudentActivityRollup(models.Model):
+    """
+    Monthly per-student activity counts for rows that were archived
+    out of StudentActivity by the `archive_activity` command.
+    """
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='activity_rollups'
+    )
+    action_type = models.CharField(max_length=20, choices=StudentActivity.ACTION_CHOICES)
+    month = models.DateField() # first day of the month
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('student', 'action_type', 'month')
+        ordering = ['-month']
+
+    def __str__(self):
+        return f"{self.student.username} - {self.action_type} - {self.month:%Y-%m} ({self.count})"
     
+
 class VocabularySearch(models.Model):
     word = models.CharField(max_length=100, unique=True)
     audio_spelling = models.FileField(upload_to='vocab_audio/', null=True, blank=True)
+    # Last time /learn gave no usable audio; retried after AUDIO_RETRY_SECONDS, see pronunciation.py
+    audio_failed_at = models.DateTimeField(null=True, blank=True)
     definition = models.TextField(blank=True)
-    search_count = models.PositiveIntegerField(default=0)
+    # Mirrored from the Redis leaderboard, see app/students/leaderboard.py
+    search_count = models.PositiveIntegerField(default=0, db_index=True)
     last_searched = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.word
 
+
+class VocabularyTrendBucket(models.Model):
+    """
+    How often a word was looked up within one hour.
+    Written in batches by app/students/trends.py.
+    """
+    word = models.CharField(max_length=100)
+    hour = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('word', 'hour')
+        indexes = [
+            models.Index(fields=['hour'], name='vocab_trend_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.word} @ {self.hour:%Y-%m-%d %H}:00: {self.count}"
+
 class StoryRecommendation(models.Model):
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recommendations')
     story = models.ForeignKey('story.StoryModel', on_delete=models.CASCADE)
@@ -0,0 +1,35 @@
+"""
+Parallel password hashing for bulk imports.
+
+Kept free of model imports: spawn/forkserver workers import this module
+before Django is set up, so the initializer has to run django.setup() first.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many passwords the pool start-up costs more than it saves
+PARALLEL_HASH_THRESHOLD = 20
+
+
+def _init_worker():
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', '_config.settings')
+        django.setup()
+
+
+def _hash(password):
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
+
+
+def hash_passwords(passwords, workers):
+    """
+    Hash passwords with the configured hasher, in a process pool for large batches.
+    PBKDF2 is deliberately slow, so this is the bulk of an import's CPU time.
+    """
+    if len(passwords) < PARALLEL_HASH_THRESHOLD or workers <= 1:
+        return [_hash(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_hash, passwords, chunksize=16))
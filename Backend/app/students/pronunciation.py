@@ -0,0 +1,61 @@
+"""
+Pronunciation audio for looked-up words.
+
+The AI helper's /learn returns the clip base64 encoded. It is stored once in
+VocabularySearch.audio_spelling under a name derived from its content hash, so
+a file URL never changes meaning and can be cached by clients indefinitely
+(see the vocab_audio route in _config/urls.py).
+
+When /learn is down or returns no audio, the attempt is recorded in
+VocabularySearch.audio_failed_at and the word isn't asked for again until
+AUDIO_RETRY_SECONDS have passed.
+"""
+import base64
+import binascii
+import hashlib
+
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+AUDIO_CACHE_SECONDS = 365 * 24 * 3600
+AUDIO_RETRY_SECONDS = 6 * 3600
+
+
+def pronunciation_due(vocab):
+    """
+    True if the word has no audio and the last failed attempt (if any) is old enough to retry.
+    """
+    if vocab.audio_spelling:
+        return False
+    if vocab.audio_failed_at is None:
+        return True
+    return timezone.now() - vocab.audio_failed_at >= timedelta(seconds=AUDIO_RETRY_SECONDS)
+
+
+def record_pronunciation_failure(vocab):
+    vocab.audio_failed_at = timezone.now()
+    vocab.save(update_fields=['audio_failed_at'])
+
+
+def store_pronunciation(vocab, audio_b64):
+    """
+    Decode and save /learn's pronunciation_audio on the VocabularySearch row.
+    Returns True if audio was stored.
+    """
+    if not audio_b64 or vocab.audio_spelling:
+        return False
+    try:
+        audio = base64.b64decode(audio_b64, validate=True)
+    except (binascii.Error, ValueError) as e:
+        print(f"Invalid pronunciation audio for '{vocab.word}': {e}")
+        return False
+    if not audio:
+        return False
+
+    name = f"{hashlib.sha256(audio).hexdigest()[:32]}.wav"
+    vocab.audio_spelling.save(name, ContentFile(audio), save=False)
+    vocab.audio_failed_at = None
+    vocab.save(update_fields=['audio_spelling', 'audio_failed_at'])
+    return True
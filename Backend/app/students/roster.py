@@ -0,0 +1,200 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from _config.services import send_welcome_emails
+from app.students.models import StudentProfile
+from app.students.password_pool import hash_passwords
+from app.teachers.cohort import adjust_cohort_stats
+from app.teachers.events import publish_teacher_event
+from app.teachers.models import ClassroomMembership
+
+User = get_user_model()
+
+GRADES = {grade for grade, _ in StudentProfile.GRADE_CHOICES}
+PROFICIENCIES = {level for level, _ in StudentProfile.PROFICIENCY_CHOICES}
+
+
+def read_roster(data, filename=''):
+    """
+    Parse a roster from CSV text or a JSON list of objects into a list of dicts.
+    CSV needs a header row: email,password,first_name,last_name,grade_level,vocabulary_proficiency
+    """
+    if isinstance(data, bytes):
+        data = data.decode('utf-8-sig')
+    if filename.endswith('.json') or data.lstrip().startswith('['):
+        rows = json.loads(data)
+        if not isinstance(rows, list):
+            raise ValueError("JSON roster must be a list of students")
+        return rows
+    return list(csv.DictReader(io.StringIO(data)))
+
+
+def rows_from_request(request):
+    """
+    Roster rows from an uploaded `file` (CSV or JSON) or a JSON body {"students": [...]}.
+    Raises ValueError when the payload cannot be parsed.
+    """
+    upload = request.FILES.get('file')
+    if upload:
+        try:
+            return read_roster(upload.read(), upload.name)
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise ValueError(str(e))
+    rows = request.data.get('students')
+    if not isinstance(rows, list):
+        raise ValueError("Upload a roster `file` or send a `students` list.")
+    return rows
+
+
+def _text(row, field, row_errors, strip=True):
+    """
+    A text column of a roster row: '' when missing, an error entry when it isn't a string.
+    """
+    value = row.get(field)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        row_errors.append(f"{field} must be text.")
+        return ''
+    return value.strip() if strip else value
+
+
+def validate_rows(rows):
+    """
+    Check every row up front. Returns (valid_rows, errors); each error is
+    {"row": <1-based row number>, "email": ..., "errors": [...]}.
+    """
+    cleaned, errors = [], []
+    seen = set()
+
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({"row": number, "email": "", "errors": ["Each student must be an object with an email and password."]})
+            continue
+        row_errors = []
+        email = User.objects.normalize_email(_text(row, 'email', row_errors))
+        password = _text(row, 'password', row_errors, strip=False)
+        first_name = _text(row, 'first_name', row_errors)
+        last_name = _text(row, 'last_name', row_errors)
+
+        type_errors = len(row_errors)
+        try:
+            validate_email(email)
+        except ValidationError:
+            if not type_errors:
+                row_errors.append("A valid email is required.")
+        if email in seen:
+            row_errors.append("Duplicate email in roster.")
+        seen.add(email)
+
+        if not password and not type_errors:
+            row_errors.append("Password is required.")
+
+        try:
+            grade = row.get('grade_level') or 3
+            if isinstance(grade, bool) or not isinstance(grade, (int, str)):
+                raise TypeError
+            grade = int(grade)
+            if grade not in GRADES:
+                raise ValueError
+        except (TypeError, ValueError):
+            grade = None
+            row_errors.append(f"grade_level must be one of {sorted(GRADES)}.")
+
+        proficiency = (_text(row, 'vocabulary_proficiency', row_errors) or 'beginner').lower()
+        if proficiency not in PROFICIENCIES:
+            row_errors.append(f"vocabulary_proficiency must be one of {sorted(PROFICIENCIES)}.")
+
+        if row_errors:
+            errors.append({"row": number, "email": email, "errors": row_errors})
+            continue
+
+        cleaned.append({
+            "row": number,
+            "email": email,
+            "password": password,
+            "first_name": first_name,
+            "last_name": last_name,
+            "grade_level": grade,
+            "vocabulary_proficiency": proficiency,
+        })
+
+    # One query for every address that is already taken (username mirrors email)
+    emails = [row['email'] for row in cleaned]
+    taken = set(User.objects.filter(username__in=emails).values_list('username', flat=True))
+    taken |= set(User.objects.filter(email__in=emails).values_list('email', flat=True))
+    valid = []
+    for row in cleaned:
+        if row['email'] in taken:
+            errors.append({"row": row['row'], "email": row['email'], "errors": ["A user with this email already exists."]})
+        else:
+            valid.append(row)
+
+    errors.sort(key=lambda error: error['row'])
+    return valid, errors
+
+
+def import_roster(rows, assigned_teacher=None, skip_invalid=False, chunk_size=500, classroom=None):
+    """
+    Validate, hash and bulk-create students with their profiles, optionally into a classroom
+    (which must belong to assigned_teacher).
+    Nothing is written when a row is invalid unless skip_invalid is set.
+    Returns {"created": n, "errors": [...]}.
+    """
+    valid, errors = validate_rows(rows)
+    if errors and not skip_invalid:
+        return {"created": 0, "errors": errors}
+    if not valid:
+        return {"created": 0, "errors": errors}
+
+    hashed = hash_passwords([row['password'] for row in valid], settings.ROSTER_HASH_WORKERS)
+
+    created = []
+    with transaction.atomic():
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            users = User.objects.bulk_create([
+                User(
+                    username=row['email'],
+                    email=row['email'],
+                    first_name=row['first_name'],
+                    last_name=row['last_name'],
+                    password=hashed[start + offset],
+                    is_student=True,
+                )
+                for offset, row in enumerate(chunk)
+            ])
+            StudentProfile.objects.bulk_create([
+                StudentProfile(
+                    user=user,
+                    grade_level=row['grade_level'],
+                    vocabulary_proficiency=row['vocabulary_proficiency'],
+                    assigned_teacher=assigned_teacher,
+                )
+                for user, row in zip(users, chunk)
+            ])
+            if classroom:
+                ClassroomMembership.objects.bulk_create([
+                    ClassroomMembership(classroom=classroom, student=user) for user in users
+                ])
+            created.extend((user, row['password']) for user, row in zip(users, chunk))
+
+        # bulk_create skips post_save, so update the teacher's cohort and live dashboard directly
+        if assigned_teacher:
+            total = len(created)
+            adjust_cohort_stats(assigned_teacher.id, total_students=total)
+            transaction.on_commit(lambda: publish_teacher_event(
+                assigned_teacher.id, "counters", {"deltas": {"total_students": total}}
+            ))
+
+        # Queued in the same transaction, so mail only goes out for committed students
+        send_welcome_emails(created, "Student")
+
+    return {"created": len(created), "errors": errors}
@@ -1,3 +1,50 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from app.students.models import StudentProfile
+from app.students.roster import import_roster, read_roster, validate_rows
+
+User = get_user_model()
+
+
+class RosterImportTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username="taken@school.test", email="taken@school.test", password="pass12345")
+
+    def test_every_bad_row_is_reported_with_its_number(self):
+        rows = [
+            {"email": "arnold@school.test", "password": "bus12345", "grade_level": 3},
+            {"email": "not-an-email", "password": "bus12345"},
+            {"email": "arnold@school.test", "password": "bus12345"},
+            {"email": "taken@school.test", "password": "bus12345"},
+            {"email": "wanda@school.test", "password": "", "grade_level": 9},
+            {"email": 42, "password": ["x"], "first_name": None},
+            "carlos@school.test",
+        ]
+
+        valid, errors = validate_rows(rows)
+
+        self.assertEqual([row['email'] for row in valid], ["arnold@school.test"])
+        by_row = {error['row']: error['errors'] for error in errors}
+        self.assertEqual(sorted(by_row), [2, 3, 4, 5, 6, 7])
+        self.assertEqual(by_row[2], ["A valid email is required."])
+        self.assertEqual(by_row[3], ["Duplicate email in roster."])
+        self.assertEqual(by_row[4], ["A user with this email already exists."])
+        self.assertEqual(by_row[5], ["Password is required.", "grade_level must be one of [3, 4, 5]."])
+        # Wrong types are row errors, not exceptions
+        self.assertEqual(by_row[6], ["email must be text.", "password must be text."])
+        self.assertEqual(len(by_row[7]), 1)
+
+    def test_invalid_rows_block_the_import_unless_skipped(self):
+        rows = read_roster("email,password,grade_level\n"
+                           "arnold@school.test,bus12345,4\n"
+                           "taken@school.test,bus12345,3\n")
+
+        result = import_roster(rows)
+        self.assertEqual(result['created'], 0)
+        self.assertEqual([error['row'] for error in result['errors']], [2])
+        self.assertFalse(User.objects.filter(email="arnold@school.test").exists())
+
+        result = import_roster(rows, skip_invalid=True)
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(StudentProfile.objects.get(user__email="arnold@school.test").grade_level, 4)
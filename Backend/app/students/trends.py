@@ -0,0 +1,131 @@
+"""
+Hourly vocabulary trend counters.
+
+Lookups are counted in an in-process buffer keyed by (word, hour) and written
+to VocabularyTrendBucket in one batch every VOCAB_TREND_FLUSH_SIZE lookups or
+VOCAB_TREND_FLUSH_SECONDS, and once more when the process exits. Trending
+words are scored from the recent buckets with an exponential time decay.
+Buckets older than VOCAB_TREND_RETENTION_DAYS are deleted by
+`manage.py archive_activity`.
+"""
+import atexit
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Sum, Value, When
+from django.utils import timezone
+
+from app.students.models import VocabularyTrendBucket
+
+
+def _hour(when):
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+def write_buckets(counts):
+    """
+    Add {(word, hour): n} onto the bucket rows, creating the ones that don't exist yet.
+    """
+    with transaction.atomic():
+        VocabularyTrendBucket.objects.bulk_create(
+            [VocabularyTrendBucket(word=word, hour=hour, count=0) for word, hour in counts],
+            ignore_conflicts=True,
+        )
+        for (word, hour), n in counts.items():
+            VocabularyTrendBucket.objects.filter(word=word, hour=hour).update(count=F('count') + n)
+
+
+class TrendBuffer:
+    def __init__(self, flush_size, flush_seconds):
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self._counts = Counter()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, word, when=None):
+        with self._lock:
+            self._counts[(word, _hour(when or timezone.now()))] += 1
+            self._pending += 1
+            due = (
+                self._pending >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Write everything buffered so far. On a database error the counts go back
+        into the buffer for the next flush. Returns the number of lookups written.
+        """
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            pending, self._pending = self._pending, 0
+            self._last_flush = time.monotonic()
+        if not counts:
+            return 0
+        try:
+            write_buckets(counts)
+        except Exception as e:
+            print(f"Vocabulary trend flush failed, keeping {pending} lookups buffered: {e}")
+            with self._lock:
+                self._counts.update(counts)
+                self._pending += pending
+            return 0
+        return pending
+
+
+trend_buffer = TrendBuffer(settings.VOCAB_TREND_FLUSH_SIZE, settings.VOCAB_TREND_FLUSH_SECONDS)
+atexit.register(trend_buffer.flush)
+
+
+# Words ranked in SQL (by day) before the exact hourly score, per word asked for
+CANDIDATES_PER_WORD = 5
+
+
+def trending_words(hours=168, half_life_hours=24, limit=10, now=None):
+    """
+    Words ranked by a decayed sum of their hourly counts over the last `hours`:
+    each bucket weighs 0.5 ** (age / half_life_hours), so this week's
+    searches count but today's count most.
+
+    The database sums each word with one weight per day of age and returns only
+    the best few candidates; their hourly buckets are then scored exactly here.
+    """
+    now = now or timezone.now()
+    current_hour = _hour(now)
+    since = current_hour - timedelta(hours=hours - 1)
+
+    def weight(age_hours):
+        return 0.5 ** (age_hours / half_life_hours)
+
+    day_weight = Case(
+        *[
+            When(hour__gt=current_hour - timedelta(hours=24 * (day + 1)), then=Value(weight(24 * day + 11.5)))
+            for day in range((hours + 23) // 24)
+        ],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    window = VocabularyTrendBucket.objects.filter(hour__gte=since)
+    candidates = list(
+        window.values('word')
+        .annotate(approx=Sum(F('count') * day_weight, output_field=FloatField()))
+        .order_by('-approx', 'word')
+        .values_list('word', flat=True)[:max(limit * CANDIDATES_PER_WORD, 50)]
+    )
+
+    scores = Counter()
+    totals = Counter()
+    for word, hour, count in window.filter(word__in=candidates).values_list('word', 'hour', 'count'):
+        scores[word] += count * weight((current_hour - hour).total_seconds() / 3600)
+        totals[word] += count
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{"word": word, "score": round(score, 2), "searches": totals[word]} for word, score in ranked]
@@ -1,3 +1,7 @@
 from django.contrib import admin
 
-# Register your models here.
+from app.teachers.models import Classroom, ClassroomMembership, TeacherCohortStats
+
+admin.site.register(TeacherCohortStats)
+admin.site.register(Classroom)
+admin.site.register(ClassroomMembership)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class TeachersConfig(AppConfig):
     name = 'app.teachers'
+
+    def ready(self):
+        import app.teachers.signals
@@ -0,0 +1,90 @@
+"""
+Classroom scoping for the teacher endpoints.
+
+A teacher's students are the ones assigned to them (StudentProfile.assigned_teacher);
+classrooms split that cohort into classes. Adding a student to a classroom assigns
+them to its teacher and drops any membership in another teacher's classes, so the
+two never disagree.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+
+from app.students.models import StudentProfile
+from app.teachers.cohort import refresh_cohort_stats_on_commit
+from app.teachers.models import ClassroomMembership
+
+User = get_user_model()
+
+
+def parse_classroom_id(value):
+    """
+    A classroom id from a query param or body field: None when absent, ValueError when not an id.
+    """
+    if value in (None, ''):
+        return None
+    try:
+        classroom_id = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("classroom must be a classroom id")
+    if classroom_id < 1:
+        raise ValueError("classroom must be a classroom id")
+    return classroom_id
+
+
+def teacher_students(user, classroom_id=None):
+    """
+    Students visible to `user`: the teacher's own cohort, or everyone for admins.
+    `classroom_id` narrows it to one class.
+    """
+    students = User.objects.filter(is_student=True)
+    if not user.is_admin_user:
+        students = students.filter(student_profile__assigned_teacher=user)
+    if classroom_id:
+        students = students.filter(classroom_memberships__classroom_id=classroom_id)
+    return students
+
+
+def claimable_students(user):
+    """
+    Students `user` may put in one of their classrooms: their own and unassigned
+    ones. Admins may move anyone.
+    """
+    students = User.objects.filter(is_student=True)
+    if user.is_admin_user:
+        return students
+    return students.filter(
+        Q(student_profile__assigned_teacher=user) | Q(student_profile__assigned_teacher__isnull=True)
+    )
+
+
+def add_students(classroom, student_ids):
+    """
+    Put the given students in `classroom`. Returns how many new memberships were made.
+    """
+    student_ids = list(User.objects.filter(id__in=student_ids, is_student=True).values_list('id', flat=True))
+    if not student_ids:
+        return 0
+
+    with transaction.atomic():
+        profiles = StudentProfile.objects.filter(user_id__in=student_ids).exclude(assigned_teacher=classroom.teacher)
+        previous_teachers = set(profiles.values_list('assigned_teacher_id', flat=True))
+        if profiles.update(assigned_teacher=classroom.teacher):
+            # update() skips the signals that keep the cohort totals in step
+            refresh_cohort_stats_on_commit(previous_teachers | {classroom.teacher_id})
+
+        ClassroomMembership.objects.filter(student_id__in=student_ids).exclude(
+            classroom__teacher=classroom.teacher
+        ).delete()
+
+        before = classroom.memberships.count()
+        ClassroomMembership.objects.bulk_create(
+            [ClassroomMembership(classroom=classroom, student_id=student_id) for student_id in student_ids],
+            ignore_conflicts=True,
+        )
+        return classroom.memberships.count() - before
+
+
+def remove_students(classroom, student_ids):
+    deleted, _ = classroom.memberships.filter(student_id__in=student_ids).delete()
+    return deleted
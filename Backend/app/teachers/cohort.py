@@ -0,0 +1,67 @@
+"""
+Per-teacher cohort totals for the teacher dashboard.
+
+Creates (new students, stories, vocabulary searches) are applied as F()
+increments; rarer changes such as deletions or reassignments recompute the
+affected teachers from scratch.
+"""
+from django.db import transaction
+from django.db.models import F, Sum
+
+from app.story.models import StoryModel
+from app.students.models import StudentActivity, StudentActivityRollup, StudentProfile
+from app.teachers.models import TeacherCohortStats
+
+
+def compute_stats_for_students(student_ids):
+    """
+    Dashboard totals over a set of students (a queryset of user ids or a list).
+    """
+    archived_searches = StudentActivityRollup.objects.filter(
+        student_id__in=student_ids, action_type='VOCAB_SEARCH'
+    ).aggregate(total=Sum('count'))['total'] or 0
+    return {
+        "total_stories": StoryModel.objects.filter(user_id__in=student_ids).count(),
+        # Archived searches are part of the lifetime total as well
+        "total_vocabulary_search": StudentActivity.objects.filter(
+            student_id__in=student_ids, action_type='VOCAB_SEARCH'
+        ).count() + archived_searches,
+    }
+
+
+def compute_cohort_stats(teacher_id):
+    cohort = StudentProfile.objects.filter(assigned_teacher_id=teacher_id)
+    return {
+        "total_students": cohort.count(),
+        **compute_stats_for_students(cohort.values('user_id')),
+    }
+
+
+def refresh_cohort_stats(teacher_ids):
+    for teacher_id in {teacher_id for teacher_id in teacher_ids if teacher_id}:
+        TeacherCohortStats.objects.update_or_create(teacher_id=teacher_id, defaults=compute_cohort_stats(teacher_id))
+
+
+def refresh_cohort_stats_on_commit(teacher_ids):
+    teacher_ids = list(teacher_ids)
+    transaction.on_commit(lambda: refresh_cohort_stats(teacher_ids))
+
+
+def adjust_cohort_stats(teacher_id, **deltas):
+    """
+    Apply counter deltas, e.g. adjust_cohort_stats(7, total_stories=1).
+    A teacher without a stats row yet gets a full computation instead.
+    """
+    updated = TeacherCohortStats.objects.filter(teacher_id=teacher_id).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated:
+        refresh_cohort_stats([teacher_id])
+
+
+def get_cohort_stats(teacher):
+    stats = TeacherCohortStats.objects.filter(teacher=teacher).first()
+    if stats is None:
+        refresh_cohort_stats([teacher.id])
+        stats = TeacherCohortStats.objects.get(teacher=teacher)
+    return stats
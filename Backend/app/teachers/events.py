@@ -0,0 +1,53 @@
+import json
+
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django_redis import get_redis_connection
+
+# How long the stream waits for an event before sending an SSE keep-alive comment
+KEEPALIVE_SECONDS = 15
+
+
+def teacher_channel(teacher_id):
+    return f"teacher:{teacher_id}:activity"
+
+
+def publish_teacher_event(teacher_id, event, payload):
+    """
+    Push an event to every open dashboard stream of this teacher.
+    Publishing is best effort; a Redis outage must never break the write that triggered it.
+    """
+    message = json.dumps({"event": event, "data": payload}, cls=DjangoJSONEncoder)
+    try:
+        get_redis_connection("default").publish(teacher_channel(teacher_id), message)
+    except Exception as e:
+        print(f"Activity publish failed: {e}")
+
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def stream_teacher_events(teacher_id):
+    """
+    Async generator of Server-Sent Events for one teacher, fed by Redis pub/sub.
+    """
+    client = aioredis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    await pubsub.subscribe(teacher_channel(teacher_id))
+    try:
+        # Ask the browser to reconnect after 5s if the connection drops
+        yield "retry: 5000\n\n"
+        yield format_sse("ready", {"teacher_id": teacher_id})
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=KEEPALIVE_SECONDS)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            body = json.loads(message["data"])
+            yield format_sse(body["event"], body["data"])
+    finally:
+        await pubsub.unsubscribe(teacher_channel(teacher_id))
+        await pubsub.aclose()
+        await client.aclose()
@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from app.teachers.cohort import refresh_cohort_stats
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the per-teacher dashboard totals (TeacherCohortStats) from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--teacher', type=int, action='append',
+                            help='Only rebuild this teacher id (repeatable)')
+
+    def handle(self, *args, **options):
+        teacher_ids = options['teacher'] or list(User.objects.filter(is_teacher=True).values_list('id', flat=True))
+        refresh_cohort_stats(teacher_ids)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt cohort stats for {len(teacher_ids)} teachers"))
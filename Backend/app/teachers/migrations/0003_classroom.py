@@ -0,0 +1,50 @@
+# Generated by Django 5.0 on 2026-10-19 16:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0002_teachercohortstats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Classroom',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('grade_level', models.IntegerField(choices=[(3, 'Grade 3'), (4, 'Grade 4'), (5, 'Grade 5')], default=3)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='classrooms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['grade_level', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ClassroomMembership',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('joined_at', models.DateTimeField(auto_now_add=True)),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='teachers.classroom')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='classroom_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('classroom', 'student')},
+            },
+        ),
+        migrations.AddField(
+            model_name='classroom',
+            name='students',
+            field=models.ManyToManyField(related_name='classrooms_joined', through='teachers.ClassroomMembership', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='classroom',
+            index=models.Index(fields=['teacher', 'grade_level'], name='classroom_teacher_grade_idx'),
+        ),
+    ]
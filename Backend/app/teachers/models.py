@@ -17,4 +17,55 @@ class TeacherProfile(models.Model):
     bio = models.TextField(blank=True)
 
     def __str__(self):
-        return f"Teacher: {self.user.username}"
\ No newline at end of file
+        return f"Teacher: {self.user.username}"
+
+class TeacherCohortStats(models.Model):
+    """
+    Running dashboard totals over the students assigned to a teacher.
+    Kept up to date by app/teachers/signals.py; `manage.py rebuild_cohort_stats` recomputes them.
+    """
+    teacher = models.OneToOneField(User, on_delete=models.CASCADE, related_name='cohort_stats')
+    total_students = models.PositiveIntegerField(default=0)
+    total_stories = models.PositiveIntegerField(default=0)
+    total_vocabulary_search = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Teacher cohort stats"
+
+    def __str__(self):
+        return f"Cohort of {self.teacher.username}: {self.total_students} students"
+
+
+class Classroom(models.Model):
+    """
+    A teacher's class. Members are always students assigned to that teacher,
+    so every classroom is a slice of the teacher's cohort.
+    """
+    teacher = models.ForeignKey(User, on_delete=models.CASCADE, related_name='classrooms')
+    name = models.CharField(max_length=100)
+    grade_level = models.IntegerField(choices=TeacherProfile.GRADE_CHOICES, default=3)
+    students = models.ManyToManyField(User, through='ClassroomMembership', related_name='classrooms_joined')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['grade_level', 'name']
+        indexes = [
+            models.Index(fields=['teacher', 'grade_level'], name='classroom_teacher_grade_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.teacher.username})"
+
+
+class ClassroomMembership(models.Model):
+    classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE, related_name='memberships')
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='classroom_memberships')
+    joined_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Also the (classroom, student) index; the student FK has its own
+        unique_together = ('classroom', 'student')
+
+    def __str__(self):
+        return f"{self.student.username} in {self.classroom.name}"
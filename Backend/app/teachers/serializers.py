@@ -3,6 +3,7 @@ from django.utils.timesince import timesince
 from rest_framework import serializers
 
 from app.students.models import StudentActivity
+from app.teachers.models import Classroom
 
 User = get_user_model()
 
@@ -34,6 +35,14 @@ class TeacherDashboardSerializer(serializers.Serializer):
     average_vocabulary_searched = serializers.FloatField()
     recent_student_activity = TeacherStudentActivitySerializer(many=True)
 
+class ClassroomSerializer(serializers.ModelSerializer):
+    member_count = serializers.IntegerField(read_only=True, default=0)
+
+    class Meta:
+        model = Classroom
+        fields = ['id', 'name', 'grade_level', 'member_count', 'created_at']
+        read_only_fields = ['id', 'created_at']
+
 class TeacherSelfProfileSerializer(serializers.ModelSerializer):
     grade_level = serializers.IntegerField(source='teacher_profile.grade_level')
     bio = serializers.CharField(source='teacher_profile.bio', allow_blank=True)
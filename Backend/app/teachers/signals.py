@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from app.story.models import StoryModel
+from app.students.models import StudentActivity, StudentProfile
+from app.teachers.cohort import adjust_cohort_stats, refresh_cohort_stats_on_commit
+from app.teachers.events import publish_teacher_event
+from app.teachers.serializers import TeacherStudentActivitySerializer
+
+# Dashboard counters that change when a student does something
+ACTIVITY_DELTAS = {
+    'VOCAB_SEARCH': {"total_vocabulary_search": 1},
+}
+
+
+def _assigned_teacher_id(student_id):
+    return StudentProfile.objects.filter(user_id=student_id).values_list('assigned_teacher_id', flat=True).first()
+
+
+@receiver(post_save, sender=StudentActivity)
+def publish_student_activity(sender, instance, created, **kwargs):
+    if not created:
+        return
+    teacher_id = _assigned_teacher_id(instance.student_id)
+    if not teacher_id:
+        return
+
+    deltas = ACTIVITY_DELTAS.get(instance.action_type, {})
+    if deltas:
+        adjust_cohort_stats(teacher_id, **deltas)
+
+    payload = {
+        "activity": TeacherStudentActivitySerializer(instance).data,
+        "deltas": deltas,
+    }
+    transaction.on_commit(lambda: publish_teacher_event(teacher_id, "activity", payload))
+
+
+@receiver(post_save, sender=StoryModel)
+def publish_story_created(sender, instance, created, **kwargs):
+    if not created or not instance.user.is_student:
+        return
+    teacher_id = _assigned_teacher_id(instance.user_id)
+    if teacher_id:
+        adjust_cohort_stats(teacher_id, total_stories=1)
+        transaction.on_commit(lambda: publish_teacher_event(teacher_id, "counters", {"deltas": {"total_stories": 1}}))
+
+
+@receiver(post_delete, sender=StoryModel)
+def story_deleted(sender, instance, **kwargs):
+    refresh_cohort_stats_on_commit([_assigned_teacher_id(instance.user_id)])
+
+
+@receiver(pre_save, sender=StudentProfile)
+def remember_assigned_teacher(sender, instance, **kwargs):
+    instance._previous_teacher_id = (
+        StudentProfile.objects.filter(pk=instance.pk).values_list('assigned_teacher_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=StudentProfile)
+def publish_student_assigned(sender, instance, created, **kwargs):
+    teacher_id = instance.assigned_teacher_id
+    previous_id = getattr(instance, '_previous_teacher_id', None)
+
+    if created and teacher_id:
+        adjust_cohort_stats(teacher_id, total_students=1)
+        transaction.on_commit(lambda: publish_teacher_event(teacher_id, "counters", {"deltas": {"total_students": 1}}))
+    elif not created and previous_id != teacher_id:
+        # The student's stories and searches move with them
+        refresh_cohort_stats_on_commit([previous_id, teacher_id])
+
+
+@receiver(post_delete, sender=StudentProfile)
+def student_removed(sender, instance, **kwargs):
+    refresh_cohort_stats_on_commit([instance.assigned_teacher_id])
@@ -1,3 +1,125 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from app.story.models import StoryModel
+from app.students.bulk import bulk_update_profiles
+from app.students.models import StudentActivity, StudentProfile
+from app.teachers.cohort import get_cohort_stats
+from app.teachers.models import Classroom, ClassroomMembership, TeacherCohortStats
+
+User = get_user_model()
+
+
+def make_teacher(username):
+    return User.objects.create_user(username=username, email=f"{username}@school.test",
+                                    password="pass12345", is_teacher=True)
+
+
+def make_student(username, teacher=None, grade=3):
+    user = User.objects.create_user(username=username, email=f"{username}@school.test",
+                                    password="pass12345", is_student=True)
+    StudentProfile.objects.create(user=user, grade_level=grade, assigned_teacher=teacher)
+    return user
+
+
+class CohortStatsTests(TestCase):
+    def setUp(self):
+        self.teacher = make_teacher("ms_frizzle")
+
+    def stats(self, teacher=None):
+        stats = TeacherCohortStats.objects.get(teacher=teacher or self.teacher)
+        return stats.total_students, stats.total_stories, stats.total_vocabulary_search
+
+    def test_creates_are_counted(self):
+        get_cohort_stats(self.teacher)
+        student = make_student("arnold", self.teacher)
+        StoryModel.objects.create(user=student, title="The Bus")
+        StudentActivity.objects.create(student=student, action_type='VOCAB_SEARCH', description="Searched: bus")
+        # Another teacher's student doesn't count
+        make_student("phoebe", make_teacher("mr_ruhle"))
+
+        self.assertEqual(self.stats(), (1, 1, 1))
+
+    def test_deletes_are_recomputed_on_commit(self):
+        student = make_student("arnold", self.teacher)
+        story = StoryModel.objects.create(user=student, title="The Bus")
+        self.assertEqual(self.stats(), (1, 1, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            story.delete()
+        self.assertEqual(self.stats(), (1, 0, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            student.student_profile.delete()
+        self.assertEqual(self.stats(), (0, 0, 0))
+
+    def test_bulk_reassign_moves_totals_to_the_new_teacher(self):
+        other = make_teacher("mr_ruhle")
+        students = [make_student(name, self.teacher) for name in ("arnold", "wanda")]
+        for student in students:
+            StoryModel.objects.create(user=student, title=f"{student.username}'s story")
+        get_cohort_stats(other)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk_update_profiles(
+                User.objects.filter(id__in=[student.id for student in students]), 'assign_teacher', other.id
+            )
+
+        self.assertEqual(result['updated'], 2)
+        self.assertEqual(self.stats(), (0, 0, 0))
+        self.assertEqual(self.stats(other), (2, 2, 0))
+
+
+class TeacherScopingTests(TestCase):
+    def setUp(self):
+        self.teacher = make_teacher("ms_frizzle")
+        self.other = make_teacher("mr_ruhle")
+        self.mine = make_student("arnold", self.teacher)
+        self.theirs = make_student("phoebe", self.other)
+        self.unassigned = make_student("carlos")
+        self.classroom = Classroom.objects.create(teacher=self.teacher, name="Class 3B")
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def test_student_list_only_shows_own_students(self):
+        response = self.client.get(reverse('teacher-student-list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.mine.id])
+
+    def test_other_teachers_student_is_not_found(self):
+        url = reverse('teacher-student-detail', args=[self.theirs.id])
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.delete(url).status_code, 404)
+        self.assertTrue(User.objects.filter(id=self.theirs.id).exists())
+
+    def test_cannot_claim_other_teachers_student(self):
+        url = reverse('classroom-members', args=[self.classroom.id])
+
+        response = self.client.post(url, {"student_ids": [self.mine.id, self.theirs.id]}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['student_ids'], [self.theirs.id])
+        self.assertEqual(StudentProfile.objects.get(user=self.theirs).assigned_teacher, self.other)
+        self.assertFalse(ClassroomMembership.objects.exists())
+
+    def test_claiming_an_unassigned_student_assigns_them(self):
+        url = reverse('classroom-members', args=[self.classroom.id])
+
+        response = self.client.post(url, {"student_ids": [self.unassigned.id]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['added'], 1)
+        self.assertEqual(StudentProfile.objects.get(user=self.unassigned).assigned_teacher, self.teacher)
+
+    def test_other_teachers_classroom_is_not_found(self):
+        classroom = Classroom.objects.create(teacher=self.other, name="Class 4A")
+
+        response = self.client.post(reverse('classroom-members', args=[classroom.id]),
+                                    {"student_ids": [self.mine.id]}, format='json')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.client.get(reverse('teacher-student-list'), {'classroom': classroom.id}).data['results'], [])
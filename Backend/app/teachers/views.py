@@ -1,16 +1,29 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Count
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views import View
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 
 from _config.services import send_welcome_email
-from app.story.models import StoryModel
+from app.dashboard.pagination import keyset_paginate
+from app.students.bulk import recommend_stories, select_students
+from app.students.filters import filter_students
+from app.students.roster import import_roster, rows_from_request
 from app.students.models import StudentActivity, StudentProfile
-from app.teachers.models import TeacherProfile
+from app.teachers.classrooms import (add_students, claimable_students, parse_classroom_id,
+                                     remove_students, teacher_students)
+from app.teachers.cohort import compute_stats_for_students, get_cohort_stats
+from app.teachers.events import stream_teacher_events
+from app.teachers.models import Classroom, TeacherProfile
 from app.students.serializers import StudentUserSerializer
-from app.teachers.serializers import TeacherDashboardSerializer,TeacherSelfProfileSerializer
+from app.teachers.serializers import ClassroomSerializer, TeacherDashboardSerializer,TeacherSelfProfileSerializer
 
 User = get_user_model()
 
@@ -31,44 +44,90 @@ class TeacherDashboardAPIView(APIView):
         if not user.is_teacher:
             return Response({"error": "Access denied. Teacher only."}, status=status.HTTP_403_FORBIDDEN)
 
-        all_student_ids = User.objects.filter(is_student=True).values_list('id', flat=True)
-        total_students = all_student_ids.count()
-
-        total_stories = StoryModel.objects.filter(user_id__in=all_student_ids).count()
+        try:
+            classroom_id = parse_classroom_id(request.query_params.get('classroom'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if classroom_id:
+            # A single class is small enough to count directly
+            classroom = get_object_or_404(Classroom, pk=classroom_id, teacher=user)
+            member_ids = list(classroom.memberships.values_list('student_id', flat=True))
+            totals = {"total_students": len(member_ids), **compute_stats_for_students(member_ids)}
+        else:
+            # Totals come from the teacher's running cohort row rather than platform-wide counts
+            stats = get_cohort_stats(user)
+            totals = {
+                "total_students": stats.total_students,
+                "total_stories": stats.total_stories,
+                "total_vocabulary_search": stats.total_vocabulary_search,
+            }
 
-        vocab_activities = StudentActivity.objects.filter(
-            student_id__in=all_student_ids, 
-            action_type='VOCAB_SEARCH'
-        )
-        total_vocab_search = vocab_activities.count()
-        
         avg_vocab = 0
-        if total_students > 0:
-            avg_vocab = round(total_vocab_search / total_students, 2)
+        if totals["total_students"] > 0:
+            avg_vocab = round(totals["total_vocabulary_search"] / totals["total_students"], 2)
 
         recent_activities = StudentActivity.objects.filter(
-            student_id__in=all_student_ids
+            student_id__in=teacher_students(user, classroom_id).values('id')
         ).select_related('student').order_by('-timestamp')[:10]
 
         dashboard_data = {
-            "total_students": total_students,
-            "total_stories": total_stories,
-            "total_vocabulary_search": total_vocab_search,
+            **totals,
             "average_vocabulary_searched": avg_vocab,
             "recent_student_activity": recent_activities
         }
 
         serializer = TeacherDashboardSerializer(dashboard_data)
         return Response(serializer.data)
+
+
+def _authenticate_stream(request):
+    """
+    Resolve the JWT user for a plain Django view.
+    Browsers' EventSource cannot send headers, so ?token= is accepted as well.
+    """
+    auth = JWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else request.GET.get('token', '').encode() or None
+    if raw_token is None:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+class TeacherActivityStreamView(View):
+    """
+    Server-Sent Events stream of new student activity and dashboard counter deltas
+    for the teacher's students. Needs the ASGI server; one connection replaces polling the dashboard.
+    """
+
+    async def get(self, request):
+        user = await sync_to_async(_authenticate_stream)(request)
+        if user is None or not user.is_teacher:
+            return JsonResponse({"error": "Access denied. Teacher only."}, status=status.HTTP_403_FORBIDDEN)
+
+        response = StreamingHttpResponse(stream_teacher_events(user.id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
     
 class TeacherStudentListCreateAPIView(APIView):
     permission_classes = [IsTeacherUser]
 
     def get(self, request):
-        # Teacher views ALL students
-        students = User.objects.filter(is_student=True).select_related('student_profile')
-        serializer = StudentUserSerializer(students, many=True)
-        return Response(serializer.data)
+        # Teachers see their own students, optionally one class at a time
+        try:
+            classroom_id = parse_classroom_id(request.query_params.get('classroom'))
+            students = filter_students(
+                teacher_students(request.user, classroom_id).select_related('student_profile'),
+                request.query_params
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        page, next_after = keyset_paginate(students, request.query_params)
+        serializer = StudentUserSerializer(page, many=True)
+        return Response({"results": serializer.data, "next_after": next_after})
 
     @transaction.atomic
     def post(self, request):
@@ -81,17 +140,26 @@ class TeacherStudentListCreateAPIView(APIView):
 
         if User.objects.filter(email=email).exists():
             return Response({"error": "A student with this email already exists."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            classroom_id = parse_classroom_id(data.get('classroom_id'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        classroom = None
+        if classroom_id:
+            classroom = Classroom.objects.filter(pk=classroom_id, teacher=request.user).first()
+            if classroom is None:
+                return Response({"error": "Classroom not found."}, status=status.HTTP_400_BAD_REQUEST)
         
         # 1. Create User
         user = User.objects.create_user(
             username=email,
             email=email,
+            password=password,
             first_name=data.get('first_name', ''),
             last_name=data.get('last_name', ''),
             is_student=True
         )
-        user.set_password(password)
-        user.save()
 
         # 2. Create/Update Profile
         StudentProfile.objects.update_or_create(
@@ -103,6 +171,9 @@ class TeacherStudentListCreateAPIView(APIView):
             }
         )
 
+        if classroom:
+            add_students(classroom, [user.id])
+
         # 3. Send Email
         try:
             send_welcome_email(user, password, "Student")
@@ -112,16 +183,41 @@ class TeacherStudentListCreateAPIView(APIView):
         return Response({"message": "Student created successfully by teacher"}, status=status.HTTP_201_CREATED)
 
 
+class TeacherStudentRosterImportAPIView(APIView):
+    """
+    Bulk-create students from a CSV/JSON roster, assigned to the requesting teacher.
+    """
+    permission_classes = [IsTeacherUser]
+
+    def post(self, request):
+        try:
+            rows = rows_from_request(request)
+        except ValueError as e:
+            return Response({"error": f"Could not read roster: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            classroom_id = parse_classroom_id(request.query_params.get('classroom'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        classroom = None
+        if classroom_id:
+            classroom = get_object_or_404(Classroom, pk=classroom_id, teacher=request.user)
+
+        skip_invalid = request.query_params.get('skip_invalid') == 'true'
+        result = import_roster(rows, assigned_teacher=request.user, skip_invalid=skip_invalid, classroom=classroom)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST)
+
+
 class TeacherStudentDetailAPIView(APIView):
     permission_classes = [IsTeacherUser]
 
     def get(self, request, pk):
-        student = get_object_or_404(User, pk=pk, is_student=True)
+        student = get_object_or_404(teacher_students(request.user), pk=pk)
         serializer = StudentUserSerializer(student)
         return Response(serializer.data)
 
     def put(self, request, pk):
-        student = get_object_or_404(User, pk=pk, is_student=True)
+        student = get_object_or_404(teacher_students(request.user), pk=pk)
         data = request.data
         
         # Update User fields
@@ -139,7 +235,7 @@ class TeacherStudentDetailAPIView(APIView):
         return Response({"message": "Student profile updated successfully"})
 
     def delete(self, request, pk):
-        student = get_object_or_404(User, pk=pk, is_student=True)
+        student = get_object_or_404(teacher_students(request.user), pk=pk)
         student.delete()
         return Response({"message": "Student deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
@@ -148,7 +244,7 @@ class TeacherStudentRecommendationAPIView(APIView):
 
     def post(self, request, pk):
         # Teacher recommends to a particular student (pk is student id)
-        student = get_object_or_404(User, pk=pk, is_student=True)
+        student = get_object_or_404(teacher_students(request.user), pk=pk)
         story_id = request.data.get('story_id')
         
         if not story_id:
@@ -164,7 +260,106 @@ class TeacherStudentRecommendationAPIView(APIView):
             return Response({"message": "Story recommended by teacher", "id": rec.id})
         except Exception as e:
             return Response({"error": str(e)}, status=400)
-    
+
+
+class TeacherBulkRecommendationAPIView(APIView):
+    """
+    Recommend stories to several of the teacher's students at once (e.g. a whole class).
+    Body: {"story_ids": [...], plus "student_ids": [...], "grade": n and/or "classroom_id": n}.
+    """
+    permission_classes = [IsTeacherUser]
+
+    def post(self, request):
+        try:
+            students = select_students(teacher_students(request.user), request.data)
+            result = recommend_stories(students, request.data.get('story_ids'), request.user)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
+
+
+class ClassroomListCreateAPIView(APIView):
+    permission_classes = [IsTeacherUser]
+
+    def get(self, request):
+        classrooms = Classroom.objects.filter(teacher=request.user).annotate(member_count=Count('memberships'))
+        serializer = ClassroomSerializer(classrooms, many=True)
+        return Response(serializer.data)
+
+    def post(self, request):
+        serializer = ClassroomSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save(teacher=request.user)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ClassroomDetailAPIView(APIView):
+    permission_classes = [IsTeacherUser]
+
+    def get_object(self, request, pk):
+        return get_object_or_404(
+            Classroom.objects.annotate(member_count=Count('memberships')), pk=pk, teacher=request.user
+        )
+
+    def get(self, request, pk):
+        classroom = self.get_object(request, pk)
+        students = classroom.students.select_related('student_profile')
+        return Response({
+            **ClassroomSerializer(classroom).data,
+            "students": StudentUserSerializer(students, many=True).data,
+        })
+
+    def patch(self, request, pk):
+        serializer = ClassroomSerializer(self.get_object(request, pk), data=request.data, partial=True)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def delete(self, request, pk):
+        # Students stay assigned to the teacher, only the grouping goes
+        self.get_object(request, pk).delete()
+        return Response({"message": "Classroom deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
+
+
+class ClassroomMembersAPIView(APIView):
+    """
+    POST/DELETE {"student_ids": [...]} to add students to, or remove them from, a classroom.
+    Adding a student assigns them to this teacher.
+    """
+    permission_classes = [IsTeacherUser]
+
+    def _student_ids(self, request):
+        student_ids = request.data.get('student_ids')
+        if not isinstance(student_ids, list) or not student_ids:
+            return None
+        try:
+            return [int(student_id) for student_id in student_ids]
+        except (TypeError, ValueError):
+            return None
+
+    def post(self, request, pk):
+        classroom = get_object_or_404(Classroom, pk=pk, teacher=request.user)
+        student_ids = self._student_ids(request)
+        if student_ids is None:
+            return Response({"error": "student_ids must be a non-empty list of ids"}, status=status.HTTP_400_BAD_REQUEST)
+        # Another teacher's students can't be taken over by adding them to a class
+        allowed = set(claimable_students(request.user).filter(id__in=student_ids).values_list('id', flat=True))
+        refused = sorted(set(student_ids) - allowed)
+        if refused:
+            return Response(
+                {"error": "Only your own or unassigned students can be added", "student_ids": refused},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return Response({"added": add_students(classroom, student_ids)})
+
+    def delete(self, request, pk):
+        classroom = get_object_or_404(Classroom, pk=pk, teacher=request.user)
+        student_ids = self._student_ids(request)
+        if student_ids is None:
+            return Response({"error": "student_ids must be a non-empty list of ids"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"removed": remove_students(classroom, student_ids)})
 
 
 class TeacherMyProfileAPIView(APIView):